@@ -12,10 +12,29 @@ from dataclasses import dataclass
 from typing import List, Dict, Optional
 from difflib import SequenceMatcher
 import asyncio
+import heapq
 import re
 
 from src.graph.crm_store_v2 import CRMStoreV2
 
+# Only the best few candidates are ever shown or merged
+MAX_CANDIDATES = 3
+
+# Common Indian and English honorifics stripped before name comparison
+HONORIFICS = frozenset({
+    'garu', 'bhau', 'bhai', 'amma', 'anna', 'akka',
+    'dada', 'tai', 'mavshi', 'kaka', 'mama',
+    'mr', 'mrs', 'ms', 'dr', 'prof', 'sir', 'madam'
+})
+
+# Single alternation matching any whole-word honorific (with optional trailing dots),
+# so a name is scanned once regardless of how many honorifics are known
+_HONORIFICS_RE = re.compile(
+    r'(?<!\S)(?:'
+    + '|'.join(sorted(map(re.escape, HONORIFICS), key=len, reverse=True))
+    + r')\.*(?!\S)'
+)
+
 
 @dataclass
 class DuplicateCandidate:
@@ -118,7 +137,7 @@ class RelationExpertAgent:
             else:
                 # Multiple candidates or lower confidence
                 print(f"  ❓ {person_name} - Found {len(candidates)} potential duplicates")
-                for i, cand in enumerate(candidates[:3]):  # Show top 3
+                for i, cand in enumerate(candidates):
                     print(f"     {i+1}. {cand.existing_name} (ID: {cand.existing_id}, Score: {cand.similarity_score:.2f})")
 
                 # If all top candidates have perfect/near-perfect match, merge with first one
@@ -148,7 +167,7 @@ class RelationExpertAgent:
                         "extracted_name": person_name,
                         "candidates": [
                             {"existing_id": c.existing_id, "existing_name": c.existing_name, "score": c.similarity_score}
-                            for c in candidates[:3]
+                            for c in candidates
                         ],
                         "action": "needs_clarification",
                         "decision": "create_new"  # Default for now
@@ -175,6 +194,8 @@ class RelationExpertAgent:
         Scoring:
         - Name match only: 0.0 - 1.0
         - Name match + phone match: 1.5 - 2.5 (boosted score for high confidence)
+
+        Returns at most MAX_CANDIDATES candidates, best first.
         """
         candidates = []
 
@@ -230,10 +251,8 @@ class RelationExpertAgent:
                 }
             ))
 
-        # Sort by similarity score descending
-        candidates.sort(key=lambda x: x.similarity_score, reverse=True)
-
-        return candidates
+        # Keep only the top candidates, highest similarity first
+        return heapq.nlargest(MAX_CANDIDATES, candidates, key=lambda c: c.similarity_score)
 
     def _normalize_phone(self, phone: Optional[str]) -> str:
         """
@@ -265,21 +284,8 @@ class RelationExpertAgent:
         if not name:
             return ""
 
-        # Common Indian honorifics
-        honorifics = [
-            'garu', 'bhau', 'bhai', 'amma', 'anna', 'akka',
-            'dada', 'tai', 'mavshi', 'kaka', 'mama',
-            'mr', 'mrs', 'ms', 'dr', 'prof', 'sir', 'madam'
-        ]
-
-        # Lowercase and remove extra whitespace
-        normalized = ' '.join(name.lower().strip().split())
-
-        # Remove honorifics
-        words = normalized.split()
-        filtered_words = [w for w in words if w.rstrip('.') not in honorifics]
-
-        return ' '.join(filtered_words)
+        # Lowercase, remove honorifics and collapse whitespace
+        return ' '.join(_HONORIFICS_RE.sub(' ', name.lower()).split())
 
     def _calculate_name_similarity(self, name1: str, name2: str) -> float:
         """Calculate similarity between two names (0.0 - 1.0)."""
@@ -299,21 +305,20 @@ class RelationExpertAgent:
 
         Priority: Keep existing data, only add new fields if missing.
         """
-        merged = new_data.copy()
-
-        # Mark as existing person for storage agent
-        merged["existing_id"] = existing_id
-        merged["name"] = existing_data["full_name"]  # Use existing name
-
-        # Keep existing data if new data is missing
-        if not merged.get("gender") and existing_data.get("gender"):
-            merged["gender"] = existing_data["gender"]
-        if not merged.get("phone") and existing_data.get("phone"):
-            merged["phone"] = existing_data["phone"]
-        if not merged.get("email") and existing_data.get("email"):
-            merged["email"] = existing_data["email"]
-
-        return merged
+        # Keep existing data where new data is missing
+        backfill = {
+            key: existing_data[key]
+            for key in ("gender", "phone", "email")
+            if not new_data.get(key) and existing_data.get(key)
+        }
+
+        # Mark as existing person for storage agent, using the existing name
+        return {
+            **new_data,
+            "existing_id": existing_id,
+            "name": existing_data["full_name"],
+            **backfill
+        }
 
     def _update_relationship_names(self, relationships: list, merges: list) -> list:
         """Update relationship person names if they were merged."""
@@ -15,17 +15,25 @@ Copyright (c) 2025 Shrinivas Deshpande. All rights reserved.
 """
 
 from dataclasses import dataclass, field
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, NamedTuple
 import asyncio
-from collections import defaultdict
+import logging
+import re
+import string
+import sys
+from collections import defaultdict, deque
+
+import numpy as np
 
 from src.mcp.client import call_crm_tool
 from src.graph.family_graph import FamilyGraph
 from src.graph.person_store import PersonStore
 from src.graph.crm_store_v2 import CRMStoreV2
 
+logger = logging.getLogger(__name__)
 
-@dataclass
+
+@dataclass(slots=True)
 class StoredPerson:
     """Person stored in CRM."""
     person_id: int
@@ -34,7 +42,7 @@ class StoredPerson:
     existing: bool = False
 
 
-@dataclass
+@dataclass(slots=True)
 class StoredFamily:
     """Family stored in CRM."""
     family_id: int
@@ -43,7 +51,7 @@ class StoredFamily:
     city: str
 
 
-@dataclass
+@dataclass(slots=True)
 class DuplicatePerson:
     """Person identified as duplicate."""
     name: str
@@ -52,6 +60,181 @@ class DuplicatePerson:
     reason: str
 
 
+# Person upserts are sent in chunks of about this many, with at most
+# MAX_INFLIGHT_CALLS chunks in flight at once
+PERSONS_PER_CALL = 200
+MAX_INFLIGHT_CALLS = 8
+
+# Family codes already looked up or created in this process,
+# keyed by (surname.lower(), city.lower())
+_family_cache: Dict[tuple, str] = {}
+
+
+def clear_family_cache():
+    """Forget cached family codes (e.g. after families were archived or between tests)."""
+    _family_cache.clear()
+
+
+# Relation types that pull transitive relatives into the speaker's family
+_FAMILY_RELATION_TYPES = frozenset({"spouse", "parent_child", "sibling", "extended"})
+
+# Above this many relationships, build the connection graph as numpy CSR arrays
+CSR_MIN_RELATIONSHIPS = 2000
+
+# Interest keywords per category, matched anywhere in an interest item
+_RELIGIOUS_RE = re.compile(r"temple|church|mosque|puja|prayer|religious|worship|devotional", re.IGNORECASE)
+_SPIRITUAL_RE = re.compile(r"meditation|yoga|spirituality|mindfulness|mantra", re.IGNORECASE)
+_SOCIAL_RE = re.compile(r"volunteer|community|service|charity|social|donation", re.IGNORECASE)
+
+# Strips punctuation when building name keys for speaker matching
+_PUNCT_KILL = str.maketrans("", "", string.punctuation)
+
+# CRM relation_type for each relation_term, used when extraction omits the type
+_TERM_TO_TYPE = {
+    **dict.fromkeys(("wife", "husband", "spouse", "bayko", "navra", "pati", "patni"), "spouse"),
+    **dict.fromkeys(("son", "daughter", "child", "father", "mother", "parent", "mulga", "mulgi"), "parent_child"),
+    **dict.fromkeys(("brother", "sister", "sibling", "bhau", "bhai", "behen"), "sibling"),
+    "friend": "friend_of",
+    **dict.fromkeys(("colleague", "coworker", "boss", "manager", "employee"), "colleague"),
+    **dict.fromkeys(("fan", "fan of", "follower", "admirer"), "fan_of"),
+    **dict.fromkeys(("mentor", "mentee", "teacher", "student"), "mentor"),
+    "neighbor": "neighbor",
+    "roommate": "roommate",
+    "classmate": "classmate",
+}
+
+
+def _categorize_interests(interests: str) -> tuple[str, str, str, str]:
+    """
+    Split free-text interests into CRM categories.
+
+    Returns:
+        Tuple of (religious, spiritual, social, hobbies) comma-separated strings
+    """
+    if not interests:
+        return "", "", "", ""
+
+    # Split interests by comma or semicolon
+    interest_items = [item.strip() for item in interests.replace(';', ',').split(',') if item.strip()]
+
+    # Categorize each interest
+    religious, spiritual, social, other = [], [], [], []
+    for item in interest_items:
+        if _RELIGIOUS_RE.search(item):
+            religious.append(item)
+        elif _SPIRITUAL_RE.search(item):
+            spiritual.append(item)
+        elif _SOCIAL_RE.search(item):
+            social.append(item)
+        else:
+            # Default to hobbies
+            other.append(item)
+
+    religious_interests = ", ".join(religious)
+    spiritual_interests = ", ".join(spiritual)
+    social_interests = ", ".join(social)
+    hobbies = ", ".join(other)
+
+    # If no categorization happened, put everything in hobbies
+    if not (religious_interests or spiritual_interests or social_interests or hobbies):
+        hobbies = interests
+
+    return religious_interests, spiritual_interests, social_interests, hobbies
+
+
+def _name_key(name: str) -> str:
+    """
+    Case-, punctuation- and spacing-insensitive key for matching names.
+
+    Keys are interned, so the repeated dict and set lookups made while
+    grouping compare them by identity.
+    """
+    return sys.intern(" ".join(name.casefold().translate(_PUNCT_KILL).split()))
+
+
+def _split_name(name: str) -> tuple[str, str, str]:
+    """
+    Split a stripped, non-empty name into (first, last, surname).
+
+    Equivalent to splitting on whitespace and re-joining the tail with single
+    spaces, but single-spaced names (the common case) are handled with
+    partition calls and no intermediate list.
+    """
+    if "  " not in name and name.isprintable():
+        first, _, last = name.partition(" ")
+        return first, last, last.rpartition(" ")[2] or first
+
+    name_parts = name.split()
+    return name_parts[0], " ".join(name_parts[1:]), name_parts[-1]
+
+
+def _is_family_edge(rel: dict) -> bool:
+    """Whether a relationship links relatives (as opposed to friends, colleagues, ...)."""
+    relation_type = rel.get("relation_type") or _TERM_TO_TYPE.get((rel.get("relation_term") or "").lower(), "")
+    return relation_type in _FAMILY_RELATION_TYPES
+
+
+def _csr_speaker_family(relationships: list, key: str) -> frozenset:
+    """
+    CSR variant of StorageAgent._speaker_family for large batches.
+
+    Name keys are interned to ints and edges are stored (in both directions) as
+    sorted arrays with a parallel family-edge mask, avoiding a Python
+    container per person.
+    """
+    name_ids = {}
+    src, dst, family = [], [], []
+    for rel in relationships:
+        p1 = _name_key(rel.get("person1", ""))
+        p2 = _name_key(rel.get("person2", ""))
+        if p1 and p2:
+            i = name_ids.setdefault(p1, len(name_ids))
+            j = name_ids.setdefault(p2, len(name_ids))
+            is_family = _is_family_edge(rel)
+            src += (i, j)
+            dst += (j, i)
+            family += (is_family, is_family)
+
+    node = name_ids.get(key)
+    if node is None:
+        return frozenset()
+
+    src_ids = np.asarray(src, dtype=np.int32)
+    order = np.argsort(src_ids, kind="stable")
+    indices = np.asarray(dst, dtype=np.int32)[order]
+    family_mask = np.asarray(family, dtype=bool)[order]
+    indptr = np.searchsorted(src_ids[order], np.arange(len(name_ids) + 1))
+
+    # Direct connections of any kind, then relatives reachable over family edges
+    members = set(indices[indptr[node]:indptr[node + 1]].tolist())
+    seen = {node}
+    queue = deque([node])
+    while queue:
+        n = queue.popleft()
+        lo, hi = indptr[n], indptr[n + 1]
+        for neighbor in indices[lo:hi][family_mask[lo:hi]].tolist():
+            if neighbor not in seen:
+                seen.add(neighbor)
+                queue.append(neighbor)
+    members |= seen
+    members.discard(node)
+
+    names = list(name_ids)
+    return frozenset(names[i] for i in members)
+
+
+class PersonRecord(NamedTuple):
+    """Person name and location parsed once, shared by grouping and storage."""
+    name: str       # Stripped full name
+    first: str      # First token of the name
+    last: str       # Remaining tokens of the name
+    surname: str    # Last token of the name (family key)
+    city: str       # Stripped location, "Unknown" if missing
+    interests: tuple  # (religious, spiritual, social, hobbies) from _categorize_interests
+    key: str        # _name_key of the name, for speaker matching
+    raw: dict       # Original extracted person dict
+
+
 @dataclass
 class StorageResult:
     """Result from storage agent."""
@@ -77,7 +260,17 @@ class StorageAgent:
         self.family_graph = FamilyGraph()
         self.person_store = PersonStore()
         self.crm_store = CRMStoreV2()
-        self.name_to_graph_id: Dict[str, int] = {}  # Track name -> GraphLite person ID
+
+        # GraphLite edge writer per relation_term, called as (person1_id, person2_id)
+        graph = self.family_graph
+        self._graph_dispatch = {
+            **dict.fromkeys(("wife", "husband", "spouse", "bayko", "navra", "pati", "patni"), graph.add_spouse),
+            # person1 has son/daughter person2 -> person1 is parent of person2
+            **dict.fromkeys(("son", "daughter", "child", "mulga", "mulgi"), graph.add_parent_child),
+            # person1 has father/mother person2 -> person2 is parent of person1
+            **dict.fromkeys(("father", "mother", "parent"), lambda p1, p2: graph.add_parent_child(p2, p1)),
+            **dict.fromkeys(("brother", "sister", "sibling", "bhau", "bhai", "behen"), graph.add_sibling),
+        }
 
     async def store(self, extraction: dict) -> StorageResult:
         """
@@ -95,66 +288,53 @@ class StorageAgent:
         Returns:
             StorageResult with details of what was stored
         """
-        result = StorageResult()
-
         if not extraction.get("success"):
-            result.success = False
-            result.errors.append("Invalid extraction result")
-            return result
+            return StorageResult(success=False, errors=["Invalid extraction result"])
 
         persons = extraction.get("persons", [])
         relationships = extraction.get("relationships", [])
 
         if not persons:
-            result.success = True
-            result.summary = "No persons to store"
-            return result
+            return StorageResult(summary="No persons to store")
+
+        result = StorageResult()
 
         try:
-            # STEP 0: Separate duplicates from new persons
-            new_persons = []
-            for person in persons:
-                if person.get("existing_id"):
-                    # This is a duplicate - don't store, just record it
-                    existing_id = person["existing_id"]
-                    result.duplicates_skipped.append(DuplicatePerson(
-                        name=person.get("name", "Unknown"),
-                        existing_id=existing_id,
-                        existing_name=person.get("name", "Unknown"),
-                        reason=f"Auto-merged with existing person #{existing_id} (high similarity)"
-                    ))
-                    print(f"[StorageAgent] SKIPPING duplicate: {person.get('name')} (existing #{existing_id})")
-                else:
-                    # This is a new person - store it
-                    new_persons.append(person)
+            # STEP 0: Separate duplicates from new persons, parse the new ones
+            # and group them by family in a single preparation pass
+            new_persons, records, family_groups, person_to_family_key = self._prepare(
+                persons, relationships, result
+            )
 
             # If all persons are duplicates, we still need to store relationships
             if not new_persons:
                 # No new persons to create, but we may have relationships to store
-                print(f"[StorageAgent] All persons are duplicates. Storing relationships only...")
-
-                # Store relationships (for quick CRM queries)
-                await self._store_relationships_crm(relationships, result)
+                logger.debug("All persons are duplicates. Storing relationships only...")
 
-                # Also store relationships in GraphLite
-                self._store_in_graphlite([], relationships, result)
+                # Store relationships in CRM (for quick queries) and GraphLite concurrently
+                await asyncio.gather(
+                    self._store_relationships_crm(relationships, result),
+                    asyncio.to_thread(self._store_in_graphlite, [], relationships, result)
+                )
 
                 result.success = True
                 result.summary = self._generate_summary(result)
                 return result
 
-            # TOOL 1: Populate GraphLite (FamilyGraph) for tree visualization - ONLY new persons
-            self._store_in_graphlite(new_persons, relationships, result)
-
             # TOOL 2: Populate CRM V2 (SQLite) for structured queries - ONLY new persons
-            # Step 2a: Group persons by family
-            family_groups, person_to_family_key = self._group_by_family_smart(new_persons, relationships)
+            # Step 2a: Persons were grouped by family in _prepare
 
             # Step 2b: Create or find families
-            family_map = await self._ensure_families(family_groups, result)
+            # TOOL 1 runs alongside: populate GraphLite (FamilyGraph) for tree
+            # visualization - ONLY new persons. GraphLite is local and synchronous,
+            # so it runs in a worker thread while the family round-trips are in flight
+            family_map, _ = await asyncio.gather(
+                self._ensure_families(family_groups, result),
+                asyncio.to_thread(self._store_in_graphlite, records, relationships, result)
+            )
 
             # Step 2c: Store person profiles
-            await self._store_persons(new_persons, family_map, person_to_family_key, result)
+            await self._store_persons(records, family_map, person_to_family_key, result)
 
             # Step 2d: Store relationships (for quick CRM queries)
             await self._store_relationships_crm(relationships, result)
@@ -172,79 +352,151 @@ class StorageAgent:
 
         return result
 
-    def _group_by_family_smart(self, persons: list, relationships: list) -> tuple[dict, dict]:
+    def _prepare(self, persons: list, relationships: list, result: StorageResult) -> tuple:
         """
-        Group persons by family using relationships and speaker information.
+        Split duplicates from new persons and parse the new ones, in one pass.
 
-        This improved version uses relationships to group related people together.
+        Duplicates (persons carrying an existing_id) are recorded on the result.
+        Each new person's name, location and interests are parsed once into a
+        PersonRecord; all CPU-bound preparation happens here, before any CRM
+        round-trip, so the storage steps only assemble payloads and await I/O.
+        Persons without a usable name are not stored in CRM.
 
         Returns:
-            Tuple of:
-            - Dict mapping (surname, city) -> list of persons
-            - Dict mapping person_name -> (surname, city) family key
+            Tuple of (new person dicts, records, family groups, person-to-family-key)
         """
-        # First, identify the speaker (primary person)
+        new_persons = []
+        records = []
         speaker = None
-        speaker_surname = None
-        speaker_city = None
-
         for person in persons:
-            if person.get("is_speaker"):
-                speaker = person
-                name = person.get("name") or ""
-                name = name.strip() if isinstance(name, str) else ""
-                name_parts = name.split()
-                speaker_surname = name_parts[-1] if name_parts else "Unknown"
-                location = person.get("location") or ""
-                speaker_city = location.strip() if isinstance(location, str) and location else "Unknown"
-                break
-
-        # Build a relationship graph to find connected people
-        person_connections = defaultdict(set)
-        for rel in relationships:
-            p1 = rel.get("person1", "")
-            p2 = rel.get("person2", "")
-            if p1 and p2:
-                person_connections[p1].add(p2)
-                person_connections[p2].add(p1)
+            existing_id = person.get("existing_id")
+            if existing_id:
+                # This is a duplicate - don't store, just record it
+                result.duplicates_skipped.append(DuplicatePerson(
+                    name=person.get("name", "Unknown"),
+                    existing_id=existing_id,
+                    existing_name=person.get("name", "Unknown"),
+                    reason=f"Auto-merged with existing person #{existing_id} (high similarity)"
+                ))
+                logger.debug("SKIPPING duplicate: %s (existing #%s)", person.get("name"), existing_id)
+                continue
 
-        # Group persons and track person-to-family mapping
-        groups = defaultdict(list)
-        person_to_family_key = {}  # Track which family each person belongs to
-        speaker_group_key = None
+            # This is a new person - store it
+            new_persons.append(person)
 
-        for person in persons:
             name = person.get("name") or ""
             name = name.strip() if isinstance(name, str) else ""
             if not name:
                 continue
 
-            name_parts = name.split()
-            surname = name_parts[-1] if name_parts else "Unknown"
+            first, last, surname = _split_name(name)
             location = person.get("location") or ""
-            city = location.strip() if isinstance(location, str) and location else "Unknown"
+            interests = person.get("interests") or ""
+            if isinstance(interests, list):
+                interests = ", ".join(str(i) for i in interests)
+
+            record = PersonRecord(
+                name=name,
+                first=first,
+                last=last,
+                surname=surname,
+                city=location.strip() if isinstance(location, str) and location else "Unknown",
+                interests=_categorize_interests(str(interests)),
+                key=_name_key(name),
+                raw=person
+            )
+            records.append(record)
+
+            # The first speaker is the primary person
+            if speaker is None and person.get("is_speaker"):
+                speaker = record
+
+        family_groups, person_to_family_key = self._group_by_family_smart(records, relationships, speaker)
+        return new_persons, records, family_groups, person_to_family_key
+
+    def _group_by_family_smart(
+        self, records: List[PersonRecord], relationships: list, speaker: Optional[PersonRecord]
+    ) -> tuple[dict, dict]:
+        """
+        Group persons by family using relationships and speaker information.
+
+        This improved version uses relationships to group related people together.
+        The speaker (primary person), if any, is identified by the caller.
+
+        Returns:
+            Tuple of:
+            - Dict mapping (surname, city) -> list of persons
+            - Dict mapping person_name -> (surname, city) family key
+        """
+        # The speaker's direct connections and transitive relatives (plus the
+        # speaker) all join the speaker's family. Names are compared by key,
+        # so "raj sharma." in a relationship still matches
+        if speaker:
+            speaker_neighbors = self._speaker_family(speaker.key, relationships) | {speaker.key}
+            speaker_group_key = (speaker.surname, speaker.city)
+        else:
+            speaker_neighbors = frozenset()
+            speaker_group_key = None
+
+        # Group persons and track person-to-family mapping
+        groups = defaultdict(list)
+        person_to_family_key = {}  # Track which family each person belongs to
+
+        for record in records:
+            name = record.name
 
             # If this person is connected to the speaker, use speaker's family
-            if speaker and speaker_surname:
-                speaker_name = speaker.get("name", "")
-                if (name in person_connections.get(speaker_name, set()) or
-                    speaker_name in person_connections.get(name, set()) or
-                    name == speaker_name):
-                    # This person is related to the speaker, use speaker's family
-                    if not speaker_group_key:
-                        speaker_group_key = (speaker_surname, speaker_city)
-                    groups[speaker_group_key].append(person)
-                    person_to_family_key[name] = speaker_group_key
-                    continue
+            if record.key in speaker_neighbors:
+                groups[speaker_group_key].append(record.raw)
+                person_to_family_key[name] = speaker_group_key
+                continue
 
             # Otherwise, group by surname and city as before
-            family_key = (surname, city)
-            groups[family_key].append(person)
+            family_key = (record.surname, record.city)
+            groups[family_key].append(record.raw)
             person_to_family_key[name] = family_key
 
         return dict(groups), person_to_family_key
 
-    def _group_by_family(self, persons: list) -> tuple[dict, dict]:
+    def _speaker_family(self, speaker_key: str, relationships: list) -> frozenset:
+        """
+        Return the name keys of everyone who joins the speaker's family.
+
+        That is everyone directly related to the speaker (friends included),
+        plus relatives reachable through chains of family relationships, such
+        as grandchildren or in-laws, found with one BFS from the speaker.
+        """
+        if len(relationships) > CSR_MIN_RELATIONSHIPS:
+            return _csr_speaker_family(relationships, speaker_key)
+
+        members = set()
+        family_edges = defaultdict(list)
+        for rel in relationships:
+            p1 = _name_key(rel.get("person1", ""))
+            p2 = _name_key(rel.get("person2", ""))
+            if not (p1 and p2):
+                continue
+            if p1 == speaker_key:
+                members.add(p2)
+            if p2 == speaker_key:
+                members.add(p1)
+            if _is_family_edge(rel):
+                family_edges[p1].append(p2)
+                family_edges[p2].append(p1)
+
+        seen = {speaker_key}
+        queue = deque([speaker_key])
+        while queue:
+            for neighbor in family_edges.get(queue.popleft(), ()):
+                if neighbor not in seen:
+                    seen.add(neighbor)
+                    queue.append(neighbor)
+        members |= seen
+        members.discard(speaker_key)
+
+        return frozenset(members)
+
+    def _group_by_family(self, records: List[PersonRecord]) -> tuple[dict, dict]:
         """
         LEGACY: Group persons by family based on surname and city.
 
@@ -256,24 +508,10 @@ class StorageAgent:
         groups = defaultdict(list)
         person_to_family_key = {}
 
-        for person in persons:
-            name = person.get("name") or ""
-            name = name.strip() if isinstance(name, str) else ""
-            location = person.get("location") or ""
-
-            if not name:
-                continue
-
-            # Extract surname (assume last part of name)
-            name_parts = name.split()
-            surname = name_parts[-1] if name_parts else "Unknown"
-
-            # Use location as city (default to "Unknown" if missing)
-            city = location.strip() if isinstance(location, str) and location else "Unknown"
-
-            family_key = (surname, city)
-            groups[family_key].append(person)
-            person_to_family_key[name] = family_key
+        for record in records:
+            family_key = (record.surname, record.city)
+            groups[family_key].append(record.raw)
+            person_to_family_key[record.name] = family_key
 
         return dict(groups), person_to_family_key
 
@@ -285,157 +523,148 @@ class StorageAgent:
             Dict mapping (surname, city) -> family_code
         """
         family_map = {}
-
-        for (surname, city), persons in family_groups.items():
-            try:
-                # Check if family already exists
-                search_result = await call_crm_tool("list_families", {
-                    "surname": surname,
-                    "city": city
-                })
-
-                if search_result.get("count", 0) > 0:
-                    # Use existing family
-                    family = search_result["families"][0]
-                    family_code = family.get("family_code", "")
-                    family_map[(surname, city)] = family_code
-                else:
-                    # Create new family
-                    create_result = await call_crm_tool("create_family", {
+        cached_keys = []  # ((surname, city), cached family code)
+        family_keys = []
+
+        for surname, city in family_groups:
+            cached = _family_cache.get((surname.lower(), city.lower()))
+            if cached:
+                cached_keys.append(((surname, city), cached))
+            else:
+                family_keys.append((surname, city))
+
+        # Look up uncached families and re-check cached codes concurrently: a
+        # cached family may have been archived since, and then must not be reused
+        results = await asyncio.gather(
+            *(call_crm_tool("get_family", {"code": code}) for _, code in cached_keys),
+            *(
+                call_crm_tool("list_families", {"surname": surname, "city": city})
+                for surname, city in family_keys
+            ),
+            return_exceptions=True
+        )
+        checks, search_results = results[:len(cached_keys)], results[len(cached_keys):]
+
+        stale = []
+        for ((surname, city), code), check in zip(cached_keys, checks):
+            # A failed check keeps the cached code; only a definite miss evicts it
+            if isinstance(check, Exception) or not check.get("success") or check.get("found"):
+                family_map[(surname, city)] = code
+            else:
+                _family_cache.pop((surname.lower(), city.lower()), None)
+                stale.append((surname, city))
+
+        if stale:
+            family_keys += stale
+            search_results += await asyncio.gather(
+                *(
+                    call_crm_tool("list_families", {"surname": surname, "city": city})
+                    for surname, city in stale
+                ),
+                return_exceptions=True
+            )
+
+        missing = []
+        for (surname, city), search_result in zip(family_keys, search_results):
+            if isinstance(search_result, Exception):
+                result.errors.append(f"Family creation error for {surname}-{city}: {str(search_result)}")
+            elif search_result.get("count", 0) > 0:
+                # Use existing family (Family.to_dict() returns "code", not "family_code")
+                family = search_result["families"][0]
+                family_code = family.get("code", "")
+                family_map[(surname, city)] = family_code
+                if family_code:
+                    _family_cache[(surname.lower(), city.lower())] = family_code
+            else:
+                missing.append((surname, city))
+
+        if not missing:
+            return family_map
+
+        # Create all missing families in one round-trip
+        try:
+            create_result = await call_crm_tool("bulk_create_families", {
+                "families": [
+                    {
                         "surname": surname,
                         "city": city,
-                        "description": f"Family created from extraction with {len(persons)} member(s)"
-                    })
-
-                    if create_result.get("success"):
-                        family_data = create_result.get("family", {})
-                        # Family.to_dict() returns "code" and "id", not "family_code" and "family_id"
-                        family_code = family_data.get("code", "")
-                        family_id = family_data.get("id", 0)
-
-                        if family_code and family_id:
-                            family_map[(surname, city)] = family_code
-
-                            result.families_created.append(StoredFamily(
-                                family_id=family_id,
-                                family_code=family_code,
-                                surname=surname,
-                                city=city
-                            ))
-                        else:
-                            result.errors.append(f"Invalid family data for {surname}-{city}: {family_data}")
-                    else:
-                        result.errors.append(f"Failed to create family {surname}-{city}")
-
-            except Exception as e:
-                result.errors.append(f"Family creation error for {surname}-{city}: {str(e)}")
+                        "description": f"Family created from extraction with {len(family_groups[(surname, city)])} member(s)"
+                    }
+                    for surname, city in missing
+                ]
+            })
+        except Exception as e:
+            result.errors.append(f"Family creation error: {str(e)}")
+            return family_map
+
+        if not create_result.get("success"):
+            result.errors.extend(f"Failed to create family {surname}-{city}" for surname, city in missing)
+            return family_map
+
+        for (surname, city), family_data in zip(missing, create_result.get("families", [])):
+            # Family.to_dict() returns "code" and "id", not "family_code" and "family_id"
+            family_code = family_data.get("code", "")
+            family_id = family_data.get("id", 0)
+
+            if family_code and family_id:
+                family_map[(surname, city)] = family_code
+                _family_cache[(surname.lower(), city.lower())] = family_code
+
+                result.families_created.append(StoredFamily(
+                    family_id=family_id,
+                    family_code=family_code,
+                    surname=surname,
+                    city=city
+                ))
+            else:
+                result.errors.append(f"Invalid family data for {surname}-{city}: {family_data}")
 
         return family_map
 
-    async def _store_persons(self, persons: list, family_map: dict, person_to_family_key: dict, result: StorageResult):
-        """Store individual person profiles."""
-        for person_data in persons:
-            try:
-                name = person_data.get("name", "")
-                if not name:
-                    continue
-
-                # Handle None values safely
-                name = name.strip() if name else ""
-                if not name:
-                    continue
+    async def _store_persons(self, records: List[PersonRecord], family_map: dict, person_to_family_key: dict, result: StorageResult):
+        """
+        Store individual person profiles with bounded, concurrent bulk upserts.
 
-                # Extract name components
-                name_parts = name.split()
-                first_name = name_parts[0] if name_parts else name
-                last_name = " ".join(name_parts[1:]) if len(name_parts) > 1 else ""
+        Persons are packed into chunks of about PERSONS_PER_CALL without
+        splitting a family, so the server-side duplicate check for a family
+        always runs in a single transaction. Chunks are recorded in the order
+        they complete.
+        """
+        names = []
+        payloads = []
+        family_indices = defaultdict(list)  # family_code -> indices into payloads
 
-                # Get location (handle None)
-                location = person_data.get("location") or ""
-                city = location.strip() if location else "Unknown"
+        for record in records:
+            person_data = record.raw
+            try:
+                name = record.name
 
                 # Get family code from the person-to-family mapping
                 family_key = person_to_family_key.get(name)
                 family_code = family_map.get(family_key, "") if family_key else ""
 
                 # Note: Duplicates are now filtered out BEFORE this function is called
-                # So we no longer need to check for existing_id here
-
-                # Check if person already exists (fallback search for safety)
-                search_result = await call_crm_tool("search_persons", {
-                    "query": name,
-                    "family_code": family_code
-                })
-
-                if search_result.get("count", 0) > 0:
-                    # Person exists
-                    existing_person = search_result["persons"][0]
-                    person_id = existing_person.get("person_id", 0)
-
-                    if person_id:
-                        print(f"[StorageAgent] Found existing person #{person_id}: {name}")
-                        result.persons_created.append(StoredPerson(
-                            person_id=person_id,
-                            name=name,
-                            family_code=family_code,
-                            existing=True
-                        ))
-                    continue
+                # Persons already in the same family are still reused by the bulk upsert
 
-                # Create new person
                 raw_mentions = person_data.get("raw_mentions", [])
                 if isinstance(raw_mentions, list):
                     mentions_str = ", ".join(str(m) for m in raw_mentions)
                 else:
                     mentions_str = str(raw_mentions)
 
-                # Extract and categorize interests/activities
-                interests = person_data.get("interests", "")
-
-                # Parse interests into categories
-                religious_interests = ""
-                spiritual_interests = ""
-                social_interests = ""
-                hobbies = ""
-
-                if interests:
-                    interests_lower = interests.lower()
-
-                    # Keywords for religious interests
-                    religious_keywords = ['temple', 'church', 'mosque', 'puja', 'prayer', 'religious', 'worship', 'devotional']
-                    # Keywords for spiritual interests
-                    spiritual_keywords = ['meditation', 'yoga', 'spirituality', 'mindfulness', 'mantra']
-                    # Keywords for social interests
-                    social_keywords = ['volunteer', 'community', 'service', 'charity', 'social', 'donation']
-
-                    # Split interests by comma or semicolon
-                    interest_items = [item.strip() for item in interests.replace(';', ',').split(',') if item.strip()]
-
-                    # Categorize each interest
-                    for item in interest_items:
-                        item_lower = item.lower()
-                        if any(keyword in item_lower for keyword in religious_keywords):
-                            religious_interests += (", " if religious_interests else "") + item
-                        elif any(keyword in item_lower for keyword in spiritual_keywords):
-                            spiritual_interests += (", " if spiritual_interests else "") + item
-                        elif any(keyword in item_lower for keyword in social_keywords):
-                            social_interests += (", " if social_interests else "") + item
-                        else:
-                            # Default to hobbies
-                            hobbies += (", " if hobbies else "") + item
-
-                    # If no categorization happened, put everything in hobbies
-                    if not (religious_interests or spiritual_interests or social_interests or hobbies):
-                        hobbies = interests
-
-                add_result = await call_crm_tool("add_person", {
-                    "first_name": first_name,
-                    "last_name": last_name,
+                # Interests were categorized up front in _prepare
+                religious_interests, spiritual_interests, social_interests, hobbies = record.interests
+
+                family_indices[family_code].append(len(payloads))
+                names.append((name, family_code))
+                payloads.append({
+                    "first_name": record.first,
+                    "last_name": record.last,
                     "gender": person_data.get("gender") or "",
                     "occupation": person_data.get("occupation") or "",
                     "phone": person_data.get("phone") or "",
                     "email": person_data.get("email") or "",
-                    "city": city,
+                    "city": record.city,
                     "family_code": family_code,
                     "religious_interests": religious_interests,
                     "spiritual_interests": spiritual_interests,
@@ -444,35 +673,67 @@ class StorageAgent:
                     "notes": f"Created from extraction. Raw mentions: {mentions_str}"
                 })
 
+            except Exception as e:
+                result.errors.append(f"Person storage error for {person_data.get('name', 'unknown')}: {str(e)}")
+
+        if not payloads:
+            return
+
+        # Pack whole families into chunks
+        chunks = [[]]
+        for indices in family_indices.values():
+            if chunks[-1] and len(chunks[-1]) + len(indices) > PERSONS_PER_CALL:
+                chunks.append([])
+            chunks[-1].extend(indices)
+
+        semaphore = asyncio.Semaphore(MAX_INFLIGHT_CALLS)
+
+        async def upsert_chunk(chunk: list):
+            async with semaphore:
+                try:
+                    upsert_result = await call_crm_tool(
+                        "bulk_upsert_persons", {"persons": [payloads[i] for i in chunk]}
+                    )
+                except Exception as e:
+                    upsert_result = e
+            return chunk, upsert_result
+
+        # Record each chunk as soon as it finishes, so stored persons and
+        # errors appear on the result without waiting for the slowest chunk
+        for next_done in asyncio.as_completed([upsert_chunk(chunk) for chunk in chunks]):
+            chunk, upsert_result = await next_done
+
+            if isinstance(upsert_result, Exception):
+                result.errors.append(f"Person storage error: {str(upsert_result)}")
+                continue
+            if isinstance(upsert_result, str):
                 # Handle case where result is a string (error message)
-                if isinstance(add_result, str):
-                    result.errors.append(f"MCP tool returned string for {name}: {add_result}")
+                result.errors.append(f"MCP tool returned string for bulk person upsert: {upsert_result}")
+                continue
+            if not upsert_result.get("success"):
+                result.errors.append(f"Failed to add persons: {upsert_result.get('error', 'unknown error')}")
+                continue
+
+            for index, stored in zip(chunk, upsert_result.get("persons", [])):
+                name, family_code = names[index]
+                person_id = stored.get("person_id", 0)
+                existing = stored.get("existing", False)
+
+                if not person_id:
+                    result.errors.append(f"Failed to get person_id for: {name}. Response: {stored}")
                     continue
 
-                if add_result.get("success"):
-                    person_id = add_result.get("person_id", 0)
-                    person_data_returned = add_result.get("person", {})
-
-                    # Try to get person_id from either location
-                    if not person_id:
-                        person_id = person_data_returned.get("person_id", 0)
-
-                    if person_id:
-                        result.persons_created.append(StoredPerson(
-                            person_id=person_id,
-                            name=name,
-                            family_code=family_code,
-                            existing=False
-                        ))
-                    else:
-                        result.errors.append(f"Failed to get person_id for: {name}. Response: {add_result}")
-                else:
-                    result.errors.append(f"Failed to add person: {name}")
+                if existing:
+                    logger.debug("Found existing person #%s: %s", person_id, name)
 
-            except Exception as e:
-                result.errors.append(f"Person storage error for {person_data.get('name', 'unknown')}: {str(e)}")
+                result.persons_created.append(StoredPerson(
+                    person_id=person_id,
+                    name=name,
+                    family_code=family_code,
+                    existing=existing
+                ))
 
-    def _store_in_graphlite(self, persons: list, relationships: list, result: StorageResult):
+    def _store_in_graphlite(self, records: List[PersonRecord], relationships: list, result: StorageResult):
         """
         TOOL 1: Store persons and relationships in GraphLite for tree visualization.
 
@@ -481,34 +742,41 @@ class StorageAgent:
         - Relationship queries
         - Tree visualization
         """
-        self.name_to_graph_id.clear()
+        name_to_graph_id: Dict[str, int] = {}  # Track name -> GraphLite person ID for this batch
+
+        # Snapshot existing PersonStore names once instead of searching per name
+        store_index = self.person_store.get_name_index()
 
-        # Step 1: Add persons to PersonStore
-        for person_data in persons:
+        # Step 1: Add persons to PersonStore (names were parsed once in _prepare)
+        for record in records:
+            person_data = record.raw
             try:
-                name = person_data.get("name", "")
-                if not name:
-                    continue
+                name = record.name
+                name_lower = name.lower()
 
                 # Check if person already exists
-                existing = self.person_store.find_by_name(name)
-                if existing:
+                existing_id = store_index.get(name_lower)
+                if existing_id:
                     # Use existing person
-                    self.name_to_graph_id[name] = existing[0].id
+                    name_to_graph_id[name] = existing_id
                     continue
 
                 # Create new person in PersonStore
                 from src.models import Person
                 location = person_data.get("location", "")
+                interests = person_data.get("interests") or []
+                if isinstance(interests, str):
+                    interests = interests.split(",")
 
                 person_obj = Person(
                     name=name,
                     location=location,
                     gender=person_data.get("gender"),
-                    interests=person_data.get("interests", "").split(",") if person_data.get("interests") else []
+                    interests=interests
                 )
                 person_id = self.person_store.add_person(person_obj)
-                self.name_to_graph_id[name] = person_id
+                name_to_graph_id[name] = person_id
+                store_index.setdefault(name_lower, person_id)
 
             except Exception as e:
                 result.errors.append(f"GraphLite person storage error for {person_data.get('name')}: {str(e)}")
@@ -524,39 +792,29 @@ class StorageAgent:
                     continue
 
                 # Get GraphLite IDs - check newly created persons first
-                person1_id = self.name_to_graph_id.get(person1_name)
-                person2_id = self.name_to_graph_id.get(person2_name)
+                person1_id = name_to_graph_id.get(person1_name)
+                person2_id = name_to_graph_id.get(person2_name)
 
-                # If person not found in current batch, search in PersonStore for existing person
+                # If person not found in current batch, use the PersonStore snapshot
                 if not person1_id:
-                    existing = self.person_store.find_by_name(person1_name)
-                    if existing:
-                        person1_id = existing[0].id
-                        self.name_to_graph_id[person1_name] = person1_id  # Cache for future lookups
+                    person1_id = store_index.get(person1_name.lower())
 
                 if not person2_id:
-                    existing = self.person_store.find_by_name(person2_name)
-                    if existing:
-                        person2_id = existing[0].id
-                        self.name_to_graph_id[person2_name] = person2_id  # Cache for future lookups
+                    person2_id = store_index.get(person2_name.lower())
 
                 if not person1_id or not person2_id:
-                    print(f"[StorageAgent] Skipping GraphLite relationship {person1_name} -> {person2_name}: Person not found")
+                    logger.debug("Skipping GraphLite relationship %s -> %s: Person not found", person1_name, person2_name)
                     continue
 
                 # Add relationship to FamilyGraph based on term
-                if relation_term in {"wife", "husband", "spouse", "bayko", "navra", "pati", "patni"}:
-                    self.family_graph.add_spouse(person1_id, person2_id)
-                elif relation_term in {"son", "daughter", "child", "mulga", "mulgi"}:
-                    # person1 has son/daughter person2 -> person1 is parent of person2
-                    self.family_graph.add_parent_child(person1_id, person2_id)
-                elif relation_term in {"father", "mother", "parent"}:
-                    # person1 has father/mother person2 -> person2 is parent of person1
-                    self.family_graph.add_parent_child(person2_id, person1_id)
-                elif relation_term in {"brother", "sister", "sibling", "bhau", "bhai", "behen"}:
-                    self.family_graph.add_sibling(person1_id, person2_id)
-
-                print(f"[StorageAgent] Created GraphLite relationship: {person1_name} ({person1_id}) --{relation_term}--> {person2_name} ({person2_id})")
+                add_edge = self._graph_dispatch.get(relation_term)
+                if add_edge:
+                    add_edge(person1_id, person2_id)
+
+                logger.debug(
+                    "Created GraphLite relationship: %s (%s) --%s--> %s (%s)",
+                    person1_name, person1_id, relation_term, person2_name, person2_id,
+                )
 
             except Exception as e:
                 result.errors.append(f"GraphLite relationship storage error: {str(e)}")
@@ -573,11 +831,26 @@ class StorageAgent:
         if not relationships:
             return
 
-        # Build a name-to-ID mapping from stored persons
-        name_to_id = {}
-        for stored_person in result.persons_created:
-            name_to_id[stored_person.name] = stored_person.person_id
-
+        # Build a name-to-ID mapping once from this batch: stored persons plus
+        # duplicates, which already carry their existing CRM ID
+        name_to_id = {dup.name: dup.existing_id for dup in result.duplicates_skipped}
+        name_to_id.update({sp.name: sp.person_id for sp in result.persons_created})
+
+        # Resolve the remaining names with one CRM query; the loop below is pure lookups
+        # (search_persons MCP tool is broken, so use CRM store directly)
+        missing_names = {
+            name
+            for rel_data in relationships
+            for name in (rel_data.get("person1", ""), rel_data.get("person2", ""))
+            if name and name not in name_to_id
+        }
+        if missing_names:
+            found = self.crm_store.get_ids_by_names(list(missing_names))
+            for name, person_id in found.items():
+                logger.debug("Found existing person in CRM: %s (ID: %s)", name, person_id)
+            name_to_id.update(found)
+
+        rels_to_store = []
         for rel_data in relationships:
             try:
                 person1_name = rel_data.get("person1", "")
@@ -588,94 +861,49 @@ class StorageAgent:
                 if not person1_name or not person2_name:
                     continue
 
-                # Get person IDs - check newly created persons first
                 person1_id = name_to_id.get(person1_name)
                 person2_id = name_to_id.get(person2_name)
 
-                # If person not found in current batch, search in CRM for existing person
-                if not person1_id:
-                    # Use CRM store directly (search_persons MCP tool is broken)
-                    all_persons = self.crm_store.get_all()
-                    matches = [p for p in all_persons if p.full_name == person1_name]
-                    if matches:
-                        person1_id = matches[0].id
-                        name_to_id[person1_name] = person1_id  # Cache for future lookups
-                        print(f"[StorageAgent] Found existing person in CRM: {person1_name} (ID: {person1_id})")
-
-                if not person2_id:
-                    # Use CRM store directly (search_persons MCP tool is broken)
-                    all_persons = self.crm_store.get_all()
-                    matches = [p for p in all_persons if p.full_name == person2_name]
-                    if matches:
-                        person2_id = matches[0].id
-                        name_to_id[person2_name] = person2_id  # Cache for future lookups
-                        print(f"[StorageAgent] Found existing person in CRM: {person2_name} (ID: {person2_id})")
-
                 if not person1_id or not person2_id:
                     # Person not found in this extraction batch or CRM database
-                    print(f"[StorageAgent] Skipping relationship {person1_name} -> {person2_name}: Person not found")
+                    logger.debug("Skipping relationship %s -> %s: Person not found", person1_name, person2_name)
                     continue
 
                 # Map relation_type if not provided
                 if not relation_type:
                     relation_type = self._infer_relation_type(relation_term)
 
-                # Store relationship via MCP tool
-                await call_crm_tool("add_relationship", {
+                rels_to_store.append({
                     "person1_id": person1_id,
                     "person2_id": person2_id,
                     "relation_type": relation_type,
                     "relation_term": relation_term
                 })
 
-                print(f"[StorageAgent] Created relationship: {person1_name} ({person1_id}) --{relation_term}--> {person2_name} ({person2_id})")
-
             except Exception as e:
                 result.errors.append(f"CRM relationship storage error: {str(e)}")
 
+        if not rels_to_store:
+            return
+
+        # Store all relationships via one MCP call
+        try:
+            await call_crm_tool("bulk_add_relationships", {"relationships": rels_to_store})
+        except Exception as e:
+            result.errors.append(f"CRM relationship storage error: {str(e)}")
+            return
+
+        logger.debug("Created %d CRM relationship(s)", len(rels_to_store))
+
     def _infer_relation_type(self, relation_term: str) -> str:
         """Infer relation_type from relation_term."""
-        term_lower = relation_term.lower()
-
-        spouse_terms = {"wife", "husband", "spouse", "bayko", "navra", "pati", "patni"}
-        parent_child_terms = {"son", "daughter", "child", "father", "mother", "parent", "mulga", "mulgi"}
-        sibling_terms = {"brother", "sister", "sibling", "bhau", "bhai", "behen"}
-        friend_terms = {"friend"}
-        colleague_terms = {"colleague", "coworker", "boss", "manager", "employee"}
-        fan_terms = {"fan", "fan of", "follower", "admirer"}
-        mentor_terms = {"mentor", "mentee", "teacher", "student"}
-        neighbor_terms = {"neighbor"}
-        roommate_terms = {"roommate"}
-        classmate_terms = {"classmate"}
-
-        if term_lower in spouse_terms:
-            return "spouse"
-        elif term_lower in parent_child_terms:
-            return "parent_child"
-        elif term_lower in sibling_terms:
-            return "sibling"
-        elif term_lower in friend_terms:
-            return "friend_of"
-        elif term_lower in colleague_terms:
-            return "colleague"
-        elif term_lower in fan_terms:
-            return "fan_of"
-        elif term_lower in mentor_terms:
-            return "mentor"
-        elif term_lower in neighbor_terms:
-            return "neighbor"
-        elif term_lower in roommate_terms:
-            return "roommate"
-        elif term_lower in classmate_terms:
-            return "classmate"
-        else:
-            return "other"
+        return _TERM_TO_TYPE.get(relation_term.lower(), "other")
 
     def _generate_summary(self, result: StorageResult) -> str:
         """Generate human-readable summary."""
         families_count = len(result.families_created)
-        persons_new = sum(1 for p in result.persons_created if not p.existing)
-        persons_existing = sum(1 for p in result.persons_created if p.existing)
+        persons_existing = sum(p.existing for p in result.persons_created)
+        persons_new = len(result.persons_created) - persons_existing
         duplicates_count = len(result.duplicates_skipped)
         errors_count = len(result.errors)
 
@@ -699,6 +927,17 @@ class StorageAgent:
         return ", ".join(parts) if parts else "No changes"
 
 
+_storage_agent: Optional[StorageAgent] = None
+
+
+def get_storage_agent() -> StorageAgent:
+    """Get or create the shared StorageAgent instance."""
+    global _storage_agent
+    if _storage_agent is None:
+        _storage_agent = StorageAgent()
+    return _storage_agent
+
+
 async def store_extraction(extraction: dict) -> StorageResult:
     """
     Store extraction results in CRM V2.
@@ -711,5 +950,4 @@ async def store_extraction(extraction: dict) -> StorageResult:
     Returns:
         StorageResult with details of what was stored
     """
-    agent = StorageAgent()
-    return await agent.store(extraction)
+    return await get_storage_agent().store(extraction)
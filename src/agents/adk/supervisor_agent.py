@@ -9,15 +9,63 @@ Responsibilities:
 5. Assign family name to all members
 """
 
+from collections import defaultdict
 from dataclasses import dataclass, field
+from functools import lru_cache
 from typing import Optional
 
 from src.agents.adk.extraction_agent import ExtractionResult, ExtractedPerson, ExtractedRelationship
 from src.agents.adk.utils.text_utils import TextUtils
-from src.agents.adk.utils.relationship_map import RelationshipMap
+from src.agents.adk.utils.relationship_map import RelationshipMap, RelationInfo
 
 
-@dataclass
+# Relation type -> graph edge type
+_EDGE_MAP = {
+    "parent": "PARENT_OF",
+    "child": "CHILD_OF",
+    "spouse": "SPOUSE_OF",
+    "sibling": "SIBLING_OF",
+    "grandparent": "GRANDPARENT_OF",
+    "grandchild": "GRANDCHILD_OF",
+    "extended": "RELATIVE_OF"
+}
+
+# Graph edge type -> edge type seen from the other person
+_RECIP_EDGE_MAP = {
+    "PARENT_OF": "CHILD_OF",
+    "CHILD_OF": "PARENT_OF",
+    "SPOUSE_OF": "SPOUSE_OF",
+    "SIBLING_OF": "SIBLING_OF",
+    "GRANDPARENT_OF": "GRANDCHILD_OF",
+    "GRANDCHILD_OF": "GRANDPARENT_OF"
+}
+
+# Relation type -> relation type seen from the other person
+_RECIP_REL_MAP = {
+    "parent": "child",
+    "child": "parent",
+    "spouse": "spouse",
+    "sibling": "sibling"
+}
+
+# (relation type, gender) -> specific label, e.g. ("parent", "F") -> "mother"
+_SPECIFIC_LABELS = {
+    ("parent", "M"): "father",
+    ("parent", "F"): "mother",
+    ("parent", None): "parent",
+    ("child", "M"): "son",
+    ("child", "F"): "daughter",
+    ("child", None): "child",
+    ("spouse", "M"): "husband",
+    ("spouse", "F"): "wife",
+    ("spouse", None): "spouse",
+    ("sibling", "M"): "brother",
+    ("sibling", "F"): "sister",
+    ("sibling", None): "sibling",
+}
+
+
+@dataclass(slots=True)
 class ValidatedPerson:
     """Person validated by supervisor."""
     name: str
@@ -30,9 +78,10 @@ class ValidatedPerson:
     is_speaker: bool = False
     confidence: float = 1.0
     notes: list[str] = field(default_factory=list)
+    name_lower: str = field(default="", repr=False)  # Lowercased name, for matching
 
 
-@dataclass
+@dataclass(slots=True)
 class ValidatedRelationship:
     """Relationship validated with reciprocal."""
     person1: str
@@ -40,6 +89,8 @@ class ValidatedRelationship:
     relation_type: str       # PARENT_OF, CHILD_OF, SPOUSE_OF, SIBLING_OF
     specific_relation: str   # father, mother, husband, wife, brother, sister
     is_reciprocal: bool = False
+    person1_lower: str = field(default="", repr=False)  # Lowercased names, for matching
+    person2_lower: str = field(default="", repr=False)
 
 
 @dataclass
@@ -59,6 +110,10 @@ class SupervisorAgent:
     def __init__(self):
         self.relationship_map = RelationshipMap()
         self.text_utils = TextUtils()
+        
+        # The same few terms and first names recur across extractions
+        self._normalize_term = lru_cache(maxsize=512)(self.relationship_map.normalize)
+        self._infer_gender_from_name = lru_cache(maxsize=1024)(self.text_utils.infer_gender_from_name)
     
     def validate(self, extraction: ExtractionResult) -> SupervisorResult:
         """
@@ -88,16 +143,24 @@ class SupervisorAgent:
         if family_name:
             notes.append(f"Identified family name: {family_name}")
         
+        # Normalize each relationship term once and index relationships by
+        # person2, so gender inference only looks at that person's mentions
+        rel_infos = [self._normalize_term(r.relation_term) for r in extraction.relationships]
+        rels_by_person2 = defaultdict(list)
+        for rel, info in zip(extraction.relationships, rel_infos):
+            rels_by_person2[rel.person2.lower()].append(info)
+        
         # Step 2: Validate and enhance persons
         validated_persons = self._validate_persons(
             extraction.persons, 
-            extraction.relationships,
+            rels_by_person2,
             family_name
         )
         
         # Step 3: Build relationships with reciprocals
         validated_relationships = self._build_relationships(
             extraction.relationships,
+            rel_infos,
             validated_persons
         )
         
@@ -115,7 +178,7 @@ class SupervisorAgent:
     def _validate_persons(
         self, 
         persons: list[ExtractedPerson],
-        relationships: list[ExtractedRelationship],
+        rels_by_person2: dict[str, list[Optional[RelationInfo]]],
         family_name: Optional[str]
     ) -> list[ValidatedPerson]:
         """Validate and enhance person data."""
@@ -125,19 +188,21 @@ class SupervisorAgent:
             # Infer gender from relationships if not set
             gender = p.gender
             if not gender:
-                gender = self._infer_gender_from_relationships(p.name, relationships)
+                gender = self._infer_gender_from_relationships(p.name, rels_by_person2)
             if not gender:
-                gender = self.text_utils.infer_gender_from_name(p.name)
+                gender = self._infer_gender_from_name(p.name)
             
+            name = self.text_utils.clean_name(p.name)
             validated.append(ValidatedPerson(
-                name=self.text_utils.clean_name(p.name),
+                name=name,
                 gender=gender,
                 age=p.age,
                 location=p.location,
                 occupation=p.occupation,
                 family_name=family_name,
                 is_speaker=p.is_speaker,
-                marital_status="Unknown"
+                marital_status="Unknown",
+                name_lower=name.lower()
             ))
         
         return validated
@@ -145,124 +210,85 @@ class SupervisorAgent:
     def _infer_gender_from_relationships(
         self, 
         name: str, 
-        relationships: list[ExtractedRelationship]
+        rels_by_person2: dict[str, list[Optional[RelationInfo]]]
     ) -> Optional[str]:
-        """Infer gender from relationship terms."""
-        for rel in relationships:
-            # Check if this person is mentioned with a gendered term
-            if rel.person2.lower() == name.lower():
-                info = self.relationship_map.normalize(rel.relation_term)
-                if info and info.gender:
-                    return info.gender
+        """Infer gender from the normalized terms used for this person."""
+        # Check if this person is mentioned with a gendered term
+        for info in rels_by_person2.get(name.lower(), ()):
+            if info and info.gender:
+                return info.gender
         return None
     
     def _build_relationships(
         self,
         extracted: list[ExtractedRelationship],
+        rel_infos: list[Optional[RelationInfo]],
         persons: list[ValidatedPerson]
     ) -> list[ValidatedRelationship]:
         """Build validated relationships with reciprocals."""
         validated = []
-        person_map = {p.name.lower(): p for p in persons}
+        person_map = {p.name_lower: p for p in persons}
         
-        for rel in extracted:
-            info = self.relationship_map.normalize(rel.relation_term)
-            
+        # Bind lookups once; this loop runs twice per extracted relationship
+        append = validated.append
+        person_get = person_map.get
+        edge_get = _EDGE_MAP.get
+        recip_edge_get = _RECIP_EDGE_MAP.get
+        recip_rel_get = _RECIP_REL_MAP.get
+        label_get = _SPECIFIC_LABELS.get
+        seen_edges = set()
+        
+        for rel, info in zip(extracted, rel_infos):
             if not info:
                 # Unknown relationship, skip
                 continue
             
             # Map relation_type to graph edge type
-            edge_type = self._get_edge_type(info.relation_type)
+            relation_type = info.relation_type
+            edge_type = edge_get(relation_type, "RELATIVE_OF")
+            reciprocal_edge = recip_edge_get(edge_type, edge_type)
+            
+            # Skip facts already stated from either side, e.g. both
+            # "A father B" and "B son A" in the same extraction
+            p1_lower = rel.person1.lower()
+            p2_lower = rel.person2.lower()
+            edge_key = min((p1_lower, p2_lower, edge_type), (p2_lower, p1_lower, reciprocal_edge))
+            if edge_key in seen_edges:
+                continue
+            seen_edges.add(edge_key)
             
             # Get person genders for specific labels
-            p1 = person_map.get(rel.person1.lower())
-            p2 = person_map.get(rel.person2.lower())
+            p1 = person_get(p1_lower)
+            p2 = person_get(p2_lower)
             
             p1_gender = p1.gender if p1 else None
             p2_gender = p2.gender if p2 else None
             
             # Forward relationship
-            specific = self._get_specific_label(info.relation_type, p1_gender, "forward")
-            validated.append(ValidatedRelationship(
+            append(ValidatedRelationship(
                 person1=rel.person1,
                 person2=rel.person2,
                 relation_type=edge_type,
-                specific_relation=specific,
-                is_reciprocal=False
+                specific_relation=label_get((relation_type, p1_gender), relation_type),
+                is_reciprocal=False,
+                person1_lower=p1_lower,
+                person2_lower=p2_lower
             ))
             
             # Reciprocal relationship
-            reciprocal_edge = self._get_reciprocal_edge_type(edge_type)
-            reciprocal_specific = self._get_specific_label(
-                self._get_reciprocal_relation_type(info.relation_type),
-                p2_gender,
-                "forward"
-            )
-            
-            validated.append(ValidatedRelationship(
+            reciprocal_type = recip_rel_get(relation_type, relation_type)
+            append(ValidatedRelationship(
                 person1=rel.person2,
                 person2=rel.person1,
                 relation_type=reciprocal_edge,
-                specific_relation=reciprocal_specific,
-                is_reciprocal=True
+                specific_relation=label_get((reciprocal_type, p2_gender), reciprocal_type),
+                is_reciprocal=True,
+                person1_lower=p2_lower,
+                person2_lower=p1_lower
             ))
         
         return validated
     
-    def _get_edge_type(self, relation_type: str) -> str:
-        """Convert relation type to graph edge type."""
-        mapping = {
-            "parent": "PARENT_OF",
-            "child": "CHILD_OF",
-            "spouse": "SPOUSE_OF",
-            "sibling": "SIBLING_OF",
-            "grandparent": "GRANDPARENT_OF",
-            "grandchild": "GRANDCHILD_OF",
-            "extended": "RELATIVE_OF"
-        }
-        return mapping.get(relation_type, "RELATIVE_OF")
-    
-    def _get_reciprocal_edge_type(self, edge_type: str) -> str:
-        """Get reciprocal edge type."""
-        mapping = {
-            "PARENT_OF": "CHILD_OF",
-            "CHILD_OF": "PARENT_OF",
-            "SPOUSE_OF": "SPOUSE_OF",
-            "SIBLING_OF": "SIBLING_OF",
-            "GRANDPARENT_OF": "GRANDCHILD_OF",
-            "GRANDCHILD_OF": "GRANDPARENT_OF"
-        }
-        return mapping.get(edge_type, edge_type)
-    
-    def _get_reciprocal_relation_type(self, relation_type: str) -> str:
-        """Get reciprocal relation type."""
-        mapping = {
-            "parent": "child",
-            "child": "parent",
-            "spouse": "spouse",
-            "sibling": "sibling"
-        }
-        return mapping.get(relation_type, relation_type)
-    
-    def _get_specific_label(self, relation_type: str, gender: Optional[str], direction: str) -> str:
-        """Get specific relationship label based on gender."""
-        labels = {
-            ("parent", "M"): "father",
-            ("parent", "F"): "mother",
-            ("parent", None): "parent",
-            ("child", "M"): "son",
-            ("child", "F"): "daughter",
-            ("child", None): "child",
-            ("spouse", "M"): "husband",
-            ("spouse", "F"): "wife",
-            ("spouse", None): "spouse",
-            ("sibling", "M"): "brother",
-            ("sibling", "F"): "sister",
-            ("sibling", None): "sibling",
-        }
-        return labels.get((relation_type, gender), relation_type)
-    
     def _update_marital_status(
         self,
         persons: list[ValidatedPerson],
@@ -274,17 +300,27 @@ class SupervisorAgent:
         
         for rel in relationships:
             if rel.relation_type == "SPOUSE_OF":
-                married_persons.add(rel.person1.lower())
-                married_persons.add(rel.person2.lower())
+                married_persons.add(rel.person1_lower)
+                married_persons.add(rel.person2_lower)
         
         for person in persons:
-            if person.name.lower() in married_persons:
+            if person.name_lower in married_persons:
                 person.marital_status = "Married"
                 notes.append(f"Inferred {person.name} is Married from spouse relationship")
 
 
+_supervisor_agent: Optional[SupervisorAgent] = None
+
+
+def get_supervisor_agent() -> SupervisorAgent:
+    """Get or create the shared SupervisorAgent instance."""
+    global _supervisor_agent
+    if _supervisor_agent is None:
+        _supervisor_agent = SupervisorAgent()
+    return _supervisor_agent
+
+
 # Convenience function
 def validate_extraction(extraction: ExtractionResult) -> SupervisorResult:
     """Validate extraction results."""
-    agent = SupervisorAgent()
-    return agent.validate(extraction)
+    return get_supervisor_agent().validate(extraction)
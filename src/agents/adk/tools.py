@@ -1,30 +1,57 @@
 """Tool definitions for ADK agents - syncs to both databases."""
 
+from concurrent.futures import ThreadPoolExecutor
+from copy import deepcopy
+from functools import lru_cache
 from typing import Optional
-import requests
+import logging
+import os
+import re
+import threading
 
 from src.graph.person_store import PersonStore
 from src.graph.family_graph import FamilyGraph
 from src.graph.crm_store import CRMStore
+from src.graph.crm_store_v2 import CRMStoreV2
 from src.graph.enhanced_crm import EnhancedCRM, PersonProfile
 from src.models import Person
 
-# Lazy-initialized stores
-_person_store: Optional[PersonStore] = None
-_family_graph: Optional[FamilyGraph] = None
-_crm_store: Optional[CRMStore] = None
-_enhanced_crm: Optional[EnhancedCRM] = None
+logger = logging.getLogger(__name__)
 
+# Shared stores, built once by warmup() (at import only when ADK_EAGER_INIT=1)
+PERSON_STORE: Optional[PersonStore] = None
+FAMILY_GRAPH: Optional[FamilyGraph] = None
+CRM_STORE: Optional[CRMStore] = None
+ENHANCED_CRM: Optional[EnhancedCRM] = None
+CRM_STORE_V2: Optional[CRMStoreV2] = None  # profiles the fuzzy matcher searches
 
-def _get_stores():
-    """Get or initialize stores."""
-    global _person_store, _family_graph, _crm_store, _enhanced_crm
-    if _person_store is None:
-        _person_store = PersonStore()
-        _family_graph = FamilyGraph()
-        _crm_store = CRMStore()
-        _enhanced_crm = EnhancedCRM()
-    return _person_store, _family_graph, _crm_store, _enhanced_crm
+# Runs the two fuzzy matches of add_relationship side by side
+_match_pool = ThreadPoolExecutor(max_workers=4)
+
+_VALID_RELS = frozenset({"parent_child", "spouse", "sibling"})
+
+_init_lock = threading.Lock()
+
+
+def warmup():
+    """Build the shared stores once; later calls return immediately.
+
+    Server processes call this at startup so the first tool call doesn't pay
+    the init cost. Every tool also calls it, so the stores exist however the
+    module was loaded.
+    """
+    global PERSON_STORE, FAMILY_GRAPH, CRM_STORE, ENHANCED_CRM, CRM_STORE_V2
+    if CRM_STORE_V2 is not None:
+        return
+    with _init_lock:
+        if CRM_STORE_V2 is not None:
+            return
+        PERSON_STORE = PersonStore()
+        FAMILY_GRAPH = FamilyGraph()
+        CRM_STORE = CRMStore()
+        ENHANCED_CRM = EnhancedCRM()
+        # Assigned last: a non-None CRM_STORE_V2 means every store is ready
+        CRM_STORE_V2 = CRMStoreV2()
 
 
 def add_person_to_graph(
@@ -36,13 +63,13 @@ def add_person_to_graph(
     age: Optional[int] = None
 ) -> dict:
     """Add a person to both family graph and enhanced CRM."""
-    store, _, crm, enhanced = _get_stores()
+    warmup()
+    store, crm, enhanced = PERSON_STORE, CRM_STORE, ENHANCED_CRM
     
     # Check for existing in PersonStore
-    existing = store.find_by_name(name)
-    for p in existing:
-        if p.name.lower() == name.lower():
-            return {"success": True, "person_id": p.id, "name": name, "existing": True}
+    existing = store.find_exact_ci(name)
+    if existing:
+        return {"success": True, "person_id": existing.id, "name": name, "existing": True}
     
     # Split name into first/last
     name_parts = name.split()
@@ -79,137 +106,227 @@ def add_person_to_graph(
     return {"success": True, "person_id": person_id, "name": name, "existing": False}
 
 
-def add_relationship(person1_name: str, person2_name: str, relationship_type: str) -> dict:
-    """Add a relationship between two people using fuzzy name matching."""
-    store, graph, _, _ = _get_stores()
+class _MatcherError(Exception):
+    """The fuzzy matcher reported an error instead of a match result."""
+
+
+@lru_cache(maxsize=1024)
+def _fuzzy_match_cached(query: str, threshold: float, version: int) -> dict:
+    """Resolve a name with the in-process fuzzy matcher (memoized per profiles version).
+
+    Matcher errors are raised rather than returned, so lru_cache never
+    memoizes a transient failure.
+    """
+    # Imported here: the matcher pulls in src.agents, which imports this module
+    from src.mcp.fuzzy_matcher import match_person
+    result = match_person(query, similarity_threshold=threshold)
+    if result.get("error") is not None:
+        raise _MatcherError(result["error"])
+    return result
 
-    # Use fuzzy matching MCP tool for better name resolution
-    try:
-        # Match person 1 using fuzzy matching
-        response1 = requests.post(
-            "http://localhost:8003/tools/fuzzy_match_person",
-            json={"query": person1_name, "similarity_threshold": 0.75},
-            timeout=10
+
+def _fuzzy_match(query: str, threshold: float = 0.75) -> dict:
+    """Fuzzy-match a name and return a private copy of the result.
+
+    The matcher is case-insensitive, so results are cached on the lowercased
+    query. The cache is keyed on the CRM profiles version, so a write from any
+    store or process invalidates it.
+    """
+    version = CRM_STORE_V2.get_version()
+    return deepcopy(_fuzzy_match_cached(query.lower(), threshold, version))
+
+
+def _local_match(store: PersonStore, name: str) -> Optional[tuple[Person, dict]]:
+    """Resolve a name against PersonStore: exact, then unique whole-word hit, then closest.
+
+    Returns the person and matcher-style match data ("best_match" and
+    "reasoning"), or None when the name is unknown or ambiguous.
+    """
+    name = name.strip()
+    person = store.find_exact_ci(name)
+    if person:
+        return person, _match_data(person.name, "Exact name match in graph store", "high", 1.0)
+    # "Ravi" may resolve to "Ravi Kumar" but never to "Ravina"
+    words = re.compile(rf"\b{re.escape(name)}\b", re.IGNORECASE)
+    matches = [p for p in store.find_by_name(name) if words.search(p.name)]
+    if len(matches) == 1:
+        return matches[0], _match_data(matches[0].name, "Only name containing the query as whole words", "medium")
+    if not matches:
+        person = store.find_closest(name)
+        if person:
+            return person, _match_data(person.name, "Unique closest spelling in graph store", "medium")
+    return None
+
+
+def _match_data(full_name: str, reason: str, confidence: str,
+                similarity: Optional[float] = None) -> dict:
+    """Match data in the fuzzy matcher's shape for a locally resolved name."""
+    best = {"full_name": full_name, "confidence": confidence}
+    if similarity is not None:
+        best["similarity_score"] = similarity
+    return {"success": True, "best_match": best, "reasoning": [reason]}
+
+
+def _link(
+    graph_method,
+    relationship_type: str,
+    person1_name: str,
+    person2_name: str,
+    p1_id: int,
+    p2_id: int,
+    match1: dict,
+    match2: dict,
+    include_reasoning: bool
+) -> dict:
+    """Add the graph edge and build the result, whichever way the names were resolved."""
+    graph_method(p1_id, p2_id)
+    best1, best2 = match1["best_match"], match2["best_match"]
+    result = {
+        "success": True,
+        "type": relationship_type,
+        "person1_id": p1_id,
+        "person2_id": p2_id,
+        "person1_matched": best1["full_name"],
+        "person2_matched": best2["full_name"],
+        "person1_reasoning": match1.get("reasoning", []),
+        "person2_reasoning": match2.get("reasoning", []),
+        "person1_confidence": best1.get("confidence"),
+        "person2_confidence": best2.get("confidence"),
+    }
+
+    # Build detailed reasoning for UI display
+    if include_reasoning:
+        reasoning_steps = [f"🔍 NAME MATCHING FOR '{person1_name}' → '{person2_name}' relationship:"]
+        for label, query, match, best in (
+            ("Person 1", person1_name, match1, best1),
+            ("Person 2", person2_name, match2, best2),
+        ):
+            reasoning_steps.append(f"\n📌 {label}: '{query}' (query)")
+            reasoning_steps.extend([f"  • {step}" for step in match.get("reasoning", [])])
+            detail = f"confidence: {best.get('confidence')}"
+            if best.get("similarity_score") is not None:
+                detail += f", similarity: {best['similarity_score']:.1%}"
+            reasoning_steps.append(f"  ✓ Matched to: '{best['full_name']}' ({detail})")
+        reasoning_steps.append(
+            f"\n✅ Relationship created: {best1['full_name']} --[{relationship_type}]--> {best2['full_name']}"
         )
-        match1_data = response1.json()
+        result["detailed_reasoning"] = reasoning_steps
+
+    return result
 
-        # Match person 2 using fuzzy matching
-        response2 = requests.post(
-            "http://localhost:8003/tools/fuzzy_match_person",
-            json={"query": person2_name, "similarity_threshold": 0.75},
-            timeout=10
+
+def add_relationship(
+    person1_name: str,
+    person2_name: str,
+    relationship_type: str,
+    use_fuzzy: bool = True,
+    include_reasoning: bool = True
+) -> dict:
+    """Add a relationship between two people.
+
+    Names are resolved with the fuzzy matcher unless use_fuzzy is False or
+    matching times out, in which case a direct name lookup is used. Set
+    include_reasoning to False to skip building the UI "detailed_reasoning" lines.
+    """
+    if relationship_type not in _VALID_RELS:
+        return {"success": False, "error": f"Unknown relationship: {relationship_type}"}
+
+    warmup()
+    store, graph = PERSON_STORE, FAMILY_GRAPH
+    graph_method = {
+        "parent_child": graph.add_parent_child,
+        "spouse": graph.add_spouse,
+        "sibling": graph.add_sibling,
+    }[relationship_type]
+
+    # Exact hits in the graph store need no fuzzy matching
+    p1 = store.find_exact_ci(person1_name)
+    p2 = store.find_exact_ci(person2_name) if p1 else None
+    if p1 and p2:
+        exact = "Exact name match in graph store"
+        return _link(
+            graph_method, relationship_type, person1_name, person2_name, p1.id, p2.id,
+            _match_data(p1.name, exact, "high", 1.0), _match_data(p2.name, exact, "high", 1.0),
+            include_reasoning,
         )
-        match2_data = response2.json()
-
-        # Check if we found matches
-        if not match1_data.get("success") or not match1_data.get("best_match"):
-            reasoning = match1_data.get("reasoning", [])
-            return {
-                "success": False,
-                "error": f"Person not found: {person1_name}",
-                "reasoning": reasoning
-            }
-
-        if not match2_data.get("success") or not match2_data.get("best_match"):
-            reasoning = match2_data.get("reasoning", [])
-            return {
-                "success": False,
-                "error": f"Person not found: {person2_name}",
-                "reasoning": reasoning
-            }
-
-        # Get person IDs from CRM matches (need to look up in PersonStore by name)
-        person1_crm_name = match1_data["best_match"]["full_name"]
-        person2_crm_name = match2_data["best_match"]["full_name"]
-
-        # Look up in PersonStore by exact name match
-        p1_matches = store.find_by_name(person1_crm_name)
-        p2_matches = store.find_by_name(person2_crm_name)
-
-        if not p1_matches:
-            return {
-                "success": False,
-                "error": f"Person '{person1_crm_name}' found in CRM but not in PersonStore (graph database)",
-                "reasoning": match1_data.get("reasoning", [])
-            }
-        if not p2_matches:
-            return {
-                "success": False,
-                "error": f"Person '{person2_crm_name}' found in CRM but not in PersonStore (graph database)",
-                "reasoning": match2_data.get("reasoning", [])
-            }
-
-        # Get exact person IDs
-        p1_id = p1_matches[0].id
-        p2_id = p2_matches[0].id
-
-        # Add relationship to graph
-        if relationship_type == "parent_child":
-            graph.add_parent_child(p1_id, p2_id)
-        elif relationship_type == "spouse":
-            graph.add_spouse(p1_id, p2_id)
-        elif relationship_type == "sibling":
-            graph.add_sibling(p1_id, p2_id)
-        else:
-            return {"success": False, "error": f"Unknown relationship: {relationship_type}"}
-
-        # Build detailed reasoning for UI display
-        reasoning_steps = []
-        reasoning_steps.append(f"🔍 FUZZY MATCHING FOR '{person1_name}' → '{person2_name}' relationship:")
-        reasoning_steps.append(f"\n📌 Person 1: '{person1_name}' (query)")
-        reasoning_steps.extend([f"  • {step}" for step in match1_data.get("reasoning", [])])
-        reasoning_steps.append(f"  ✓ Matched to: '{person1_crm_name}' (confidence: {match1_data['best_match'].get('confidence', 0):.1%})")
-
-        reasoning_steps.append(f"\n📌 Person 2: '{person2_name}' (query)")
-        reasoning_steps.extend([f"  • {step}" for step in match2_data.get("reasoning", [])])
-        reasoning_steps.append(f"  ✓ Matched to: '{person2_crm_name}' (confidence: {match2_data['best_match'].get('confidence', 0):.1%})")
-
-        reasoning_steps.append(f"\n✅ Relationship created: {person1_crm_name} --[{relationship_type}]--> {person2_crm_name}")
-
-        return {
-            "success": True,
-            "type": relationship_type,
-            "person1_id": p1_id,
-            "person2_id": p2_id,
-            "person1_matched": person1_crm_name,
-            "person2_matched": person2_crm_name,
-            "person1_reasoning": match1_data.get("reasoning", []),
-            "person2_reasoning": match2_data.get("reasoning", []),
-            "person1_confidence": match1_data["best_match"].get("confidence"),
-            "person2_confidence": match2_data["best_match"].get("confidence"),
-            "detailed_reasoning": reasoning_steps  # NEW: Formatted reasoning for UI
-        }
-
-    except requests.RequestException as e:
-        # Fallback to old method if MCP server is not available
-        print(f"⚠️  Fuzzy matching MCP server unavailable, using fallback: {e}")
-
-        p1_matches = store.find_by_name(person1_name)
-        p2_matches = store.find_by_name(person2_name)
-
-        if not p1_matches:
-            return {"success": False, "error": f"Person not found: {person1_name}"}
-        if not p2_matches:
-            return {"success": False, "error": f"Person not found: {person2_name}"}
-
-        p1_id = p1_matches[0].id
-        p2_id = p2_matches[0].id
-
-        if relationship_type == "parent_child":
-            graph.add_parent_child(p1_id, p2_id)
-        elif relationship_type == "spouse":
-            graph.add_spouse(p1_id, p2_id)
-        elif relationship_type == "sibling":
-            graph.add_sibling(p1_id, p2_id)
-        else:
-            return {"success": False, "error": f"Unknown relationship: {relationship_type}"}
-
-        return {"success": True, "type": relationship_type, "person1_id": p1_id, "person2_id": p2_id}
+
+    # Use fuzzy matching for better name resolution
+    if use_fuzzy:
+        try:
+            # Match both people concurrently - the lookups are independent
+            future1 = _match_pool.submit(_fuzzy_match, person1_name)
+            future2 = _match_pool.submit(_fuzzy_match, person2_name)
+            match1_data = future1.result(timeout=10)
+            match2_data = future2.result(timeout=10)
+
+            # Check if we found matches
+            if not match1_data.get("success") or not match1_data.get("best_match"):
+                reasoning = match1_data.get("reasoning", [])
+                return {
+                    "success": False,
+                    "error": f"Person not found: {person1_name}",
+                    "reasoning": reasoning
+                }
+
+            if not match2_data.get("success") or not match2_data.get("best_match"):
+                reasoning = match2_data.get("reasoning", [])
+                return {
+                    "success": False,
+                    "error": f"Person not found: {person2_name}",
+                    "reasoning": reasoning
+                }
+
+            # Get person IDs from CRM matches (need to look up in PersonStore by name)
+            person1_crm_name = match1_data["best_match"]["full_name"]
+            person2_crm_name = match2_data["best_match"]["full_name"]
+
+            # Look up in PersonStore by exact (case-insensitive) name match
+            p1 = store.find_exact_ci(person1_crm_name)
+            p2 = store.find_exact_ci(person2_crm_name)
+
+            if not p1:
+                return {
+                    "success": False,
+                    "error": f"Person '{person1_crm_name}' found in CRM but not in PersonStore (graph database)",
+                    "reasoning": match1_data.get("reasoning", [])
+                }
+            if not p2:
+                return {
+                    "success": False,
+                    "error": f"Person '{person2_crm_name}' found in CRM but not in PersonStore (graph database)",
+                    "reasoning": match2_data.get("reasoning", [])
+                }
+
+            return _link(
+                graph_method, relationship_type, person1_name, person2_name,
+                p1.id, p2.id, match1_data, match2_data,
+                include_reasoning,
+            )
+
+        except TimeoutError:
+            # Fallback to direct lookup if matching stalls
+            logger.warning("Fuzzy matching timed out, using direct lookup")
+        except _MatcherError as e:
+            logger.warning("Fuzzy matching failed (%s), using direct lookup", e)
+
+    local1 = _local_match(store, person1_name)
+    if not local1:
+        return {"success": False, "error": f"Person not found: {person1_name}"}
+    local2 = _local_match(store, person2_name)
+    if not local2:
+        return {"success": False, "error": f"Person not found: {person2_name}"}
+
+    (p1, match1), (p2, match2) = local1, local2
+    return _link(
+        graph_method, relationship_type, person1_name, person2_name,
+        p1.id, p2.id, match1, match2, include_reasoning,
+    )
 
 
 def get_family_tree(person_name: str) -> dict:
     """Get family tree for a person."""
-    store, graph, _, _ = _get_stores()
+    warmup()
+    store, graph = PERSON_STORE, FAMILY_GRAPH
     
     matches = store.find_by_name(person_name)
     if not matches:
@@ -218,8 +335,12 @@ def get_family_tree(person_name: str) -> dict:
     person = matches[0]
     tree = graph.get_family_tree(person.id)
     
+    people = store.get_persons(
+        tree["parents"] + tree["spouse"] + tree["siblings"] + tree["children"]
+    )
+    
     def get_names(ids):
-        return [store.get_person(pid).name for pid in ids if store.get_person(pid)]
+        return [people[pid].name for pid in ids if pid in people]
     
     return {
         "success": True,
@@ -233,7 +354,8 @@ def get_family_tree(person_name: str) -> dict:
 
 def list_all_persons() -> dict:
     """List all persons in the graph."""
-    store, _, _, _ = _get_stores()
+    warmup()
+    store = PERSON_STORE
     persons = store.get_all()
     
     return {
@@ -245,7 +367,8 @@ def list_all_persons() -> dict:
 
 def delete_person_from_graph(person_id: int) -> dict:
     """Delete a person from both databases."""
-    store, _, _, enhanced = _get_stores()
+    warmup()
+    store, enhanced = PERSON_STORE, ENHANCED_CRM
     
     person = store.get_person(person_id)
     if not person:
@@ -257,12 +380,12 @@ def delete_person_from_graph(person_id: int) -> dict:
     deleted = store.delete_person(person_id)
     
     # Try to delete from EnhancedCRM by name match
-    name_parts = name.split()
-    first_name = name_parts[0] if name_parts else name
-    enhanced_persons = enhanced.search(query=first_name)
-    for ep in enhanced_persons:
-        if ep.full_name.lower() == name.lower():
-            enhanced.delete_person(ep.id)
-            break
+    ep = enhanced.find_by_full_name_ci(name)
+    if ep:
+        enhanced.delete_person(ep.id)
     
     return {"success": deleted, "name": name, "person_id": person_id}
+
+
+if os.getenv("ADK_EAGER_INIT") == "1":
+    warmup()
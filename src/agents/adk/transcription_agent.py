@@ -6,6 +6,7 @@ Date: December 6, 2025
 Copyright (c) 2025 Shrinivas Deshpande. All rights reserved.
 """
 
+import mmap
 from pathlib import Path
 from typing import Optional
 
@@ -33,16 +34,21 @@ class TranscriptionAgent:
         if not path.exists():
             return {"success": False, "error": f"File not found: {audio_path}"}
         
-        audio_bytes = path.read_bytes()
+        if path.stat().st_size == 0:
+            return {"success": False, "error": f"Empty audio file: {audio_path}"}
         
         try:
-            if need_english:
-                result = self.whisper.transcribe_and_translate(audio_bytes)
-            else:
-                if path.suffix.lower() == ".webm":
-                    result = self.whisper.transcribe_webm(audio_bytes)
+            # Map the file rather than copying it onto the heap
+            with path.open("rb") as f, \
+                    mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, \
+                    memoryview(mm) as audio_bytes:
+                if need_english:
+                    result = self.whisper.transcribe_and_translate(audio_bytes)
                 else:
-                    result = self.whisper.transcribe_wav(audio_bytes)
+                    if path.suffix.lower() == ".webm":
+                        result = self.whisper.transcribe_webm(audio_bytes)
+                    else:
+                        result = self.whisper.transcribe_wav(audio_bytes)
             
             return result
             
@@ -10,10 +10,20 @@ Copyright (c) 2025 Shrinivas Deshpande. All rights reserved.
 """
 
 from dataclasses import dataclass, field
-from datetime import datetime
-from typing import Optional, List, Dict, Any
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Optional, List, Dict, Any, Callable, TextIO
 from enum import Enum
 import json
+import queue
+import sqlite3
+import threading
+import time
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 
 class StepType(Enum):
@@ -26,27 +36,126 @@ class StepType(Enum):
     ERROR = "error"              # Error encountered
 
 
-@dataclass
+@dataclass(slots=True)
 class TrajectoryStep:
     """Single step in agent trajectory."""
     step_type: StepType
     agent_name: str
-    timestamp: datetime
+    timestamp: int  # Monotonic nanoseconds since the trajectory started
     content: str
     metadata: Dict[str, Any] = field(default_factory=dict)
 
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary for JSON serialization."""
+    def to_dict(self, start_time: datetime) -> Dict[str, Any]:
+        """Convert to dictionary for JSON serialization.
+
+        Args:
+            start_time: Wall-clock start of the owning trajectory
+        """
         return {
             "step_type": self.step_type.value,
             "agent_name": self.agent_name,
-            "timestamp": self.timestamp.isoformat(),
+            "timestamp": (start_time + timedelta(microseconds=self.timestamp // 1000)).isoformat(),
             "content": self.content,
             "metadata": self.metadata
         }
 
 
-@dataclass
+class _TrajectoryWorker(threading.Thread):
+    """Background thread that hands recorded steps to persistence sinks.
+
+    Steps are appended to the in-memory trajectory immediately; only the
+    (possibly slow) sinks run here, in batches, off the agent's thread.
+    """
+
+    BATCH_SIZE = 256
+
+    def __init__(self):
+        super().__init__(name="trajectory-writer", daemon=True)
+        self.queue: queue.SimpleQueue = queue.SimpleQueue()
+        self.sinks: List[Callable[[List[tuple]], None]] = []
+        self._pending = 0
+        self._idle = threading.Condition()
+
+    def run(self):
+        while True:
+            batch = [self.queue.get()]
+            try:
+                while len(batch) < self.BATCH_SIZE:
+                    batch.append(self.queue.get_nowait())
+            except queue.Empty:
+                pass
+
+            for sink in list(self.sinks):
+                try:
+                    sink(batch)
+                except Exception as e:
+                    print(f"Trajectory sink failed: {e}")
+            with self._idle:
+                self._pending -= len(batch)
+                self._idle.notify_all()
+
+    def submit(self, trajectory: "AgentTrajectory", step: TrajectoryStep):
+        """Queue a recorded step for the sinks (never blocks)."""
+        with self._idle:
+            self._pending += 1
+        self.queue.put((trajectory, step))
+
+    def flush(self):
+        """Block until every queued step has been handed to the sinks."""
+        with self._idle:
+            self._idle.wait_for(lambda: self._pending == 0)
+
+
+_writer: Optional[_TrajectoryWorker] = None
+_writer_lock = threading.Lock()
+
+
+def _get_writer() -> _TrajectoryWorker:
+    """Start the sink worker on first use."""
+    global _writer
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                writer = _TrajectoryWorker()
+                writer.start()
+                _writer = writer
+    return _writer
+
+
+class SQLiteTrajectorySink:
+    """Persist trajectory steps to SQLite, one executemany per batch."""
+
+    def __init__(self, db_path: str = "data/trajectories.db"):
+        self.db_path = db_path
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        # Only ever used from the worker thread after construction
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS trajectory_steps (
+                session_id TEXT NOT NULL,
+                agent_name TEXT NOT NULL,
+                step_type TEXT NOT NULL,
+                timestamp TEXT NOT NULL,
+                content TEXT,
+                metadata TEXT
+            )
+        """)
+        self._conn.commit()
+
+    def __call__(self, batch: List[tuple]):
+        rows = [
+            (t.session_id, step.agent_name, step.step_type.value,
+             (t.start_time + timedelta(microseconds=step.timestamp // 1000)).isoformat(),
+             step.content, json.dumps(step.metadata, default=str))
+            for t, step in batch
+        ]
+        with self._conn:
+            self._conn.executemany(
+                "INSERT INTO trajectory_steps VALUES (?, ?, ?, ?, ?, ?)", rows
+            )
+
+
+@dataclass(slots=True)
 class AgentTrajectory:
     """Complete trajectory for an agent execution."""
     session_id: str
@@ -57,17 +166,24 @@ class AgentTrajectory:
     final_result: Optional[Dict[str, Any]] = None
     success: bool = True
     error_message: Optional[str] = None
+    _t0_mono: int = field(init=False, repr=False, default=0)
+
+    def __post_init__(self):
+        # Anchor step timestamps to start_time without a wall-clock read per step
+        self._t0_mono = time.monotonic_ns()
 
     def add_step(self, step_type: StepType, content: str, metadata: Optional[Dict[str, Any]] = None):
         """Add a step to the trajectory."""
         step = TrajectoryStep(
             step_type=step_type,
             agent_name=self.agent_name,
-            timestamp=datetime.now(),
+            timestamp=time.monotonic_ns() - self._t0_mono,
             content=content,
             metadata=metadata or {}
         )
         self.steps.append(step)
+        if _writer is not None and _writer.sinks:
+            _writer.submit(self, step)
 
     def observe(self, observation: str, metadata: Optional[Dict[str, Any]] = None):
         """Record an observation."""
@@ -100,24 +216,46 @@ class AgentTrajectory:
         self.end_time = datetime.now()
         self.final_result = final_result
 
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary for JSON serialization."""
+    def _summary(self) -> Dict[str, Any]:
+        """Trajectory-level fields, without the steps."""
         return {
             "session_id": self.session_id,
             "agent_name": self.agent_name,
             "start_time": self.start_time.isoformat(),
             "end_time": self.end_time.isoformat() if self.end_time else None,
-            "steps": [step.to_dict() for step in self.steps],
             "final_result": self.final_result,
             "success": self.success,
             "error_message": self.error_message,
             "duration_ms": int((self.end_time - self.start_time).total_seconds() * 1000) if self.end_time else None
         }
 
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for JSON serialization."""
+        data = self._summary()
+        data["steps"] = [step.to_dict(self.start_time) for step in self.steps]
+        return data
+
     def to_json(self) -> str:
-        """Convert to JSON string."""
+        """Convert to JSON string (via orjson when installed)."""
+        if orjson is not None:
+            return orjson.dumps(
+                self.to_dict(),
+                option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+            ).decode()
         return json.dumps(self.to_dict(), indent=2)
 
+    def to_json_stream(self, fp: TextIO):
+        """Write the trajectory as JSON to a text stream one step at a time."""
+        fp.write("{")
+        for key, value in self._summary().items():
+            fp.write(f"{json.dumps(key)}: {json.dumps(value)}, ")
+        fp.write('"steps": [')
+        for i, step in enumerate(self.steps):
+            if i:
+                fp.write(", ")
+            fp.write(json.dumps(step.to_dict(self.start_time)))
+        fp.write("]}")
+
 
 class TrajectoryLogger:
     """Global trajectory logger for all agents."""
@@ -147,6 +285,17 @@ class TrajectoryLogger:
         cls._trajectories[session_id].append(trajectory)
         return trajectory
 
+    @classmethod
+    def add_sink(cls, sink: Callable[[List[tuple]], None]):
+        """Register a persistence sink; it receives batches of (trajectory, step)."""
+        _get_writer().sinks.append(sink)
+
+    @classmethod
+    def flush(cls):
+        """Wait until queued steps have reached the sinks (for tests)."""
+        if _writer is not None:
+            _writer.flush()
+
     @classmethod
     def get_session_trajectories(cls, session_id: str) -> List[AgentTrajectory]:
         """Get all trajectories for a session."""
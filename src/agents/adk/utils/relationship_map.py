@@ -1,10 +1,12 @@
 """Multilingual relationship mappings."""
 
+import sys
+from types import MappingProxyType
 from dataclasses import dataclass
 from typing import Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class RelationInfo:
     """Normalized relationship information."""
     term: str
@@ -14,6 +16,14 @@ class RelationInfo:
     reciprocal: str
 
 
+def _lookup_key(term) -> Optional[str]:
+    """Lookup key for a term, skipping lower() for already-lowercase input."""
+    if not term or not isinstance(term, str):
+        return None
+    term = term.strip()
+    return term if term.islower() else term.lower()
+
+
 class RelationshipMap:
     """Multilingual relationship normalizer."""
     
@@ -99,18 +109,37 @@ class RelationshipMap:
         "ammamma": RelationInfo("grandmother", "parent_child", "F", True, "grandchild"),
         "babai": RelationInfo("uncle", "extended", "M", True, "nephew_niece"),
     }
+    # Read-only view with interned keys
+    MAPPINGS = MappingProxyType({sys.intern(k): v for k, v in MAPPINGS.items()})
+    _KNOWN_TERMS = frozenset(MAPPINGS)
+    _MIN_TERM_LEN = min(map(len, MAPPINGS))
+    
+    # (canonical term, other person's gender) -> gendered reciprocal term
+    _RECIPROCALS = {
+        (term, gender): reciprocal
+        for terms, by_gender in (
+            # Parent terms take a child term back, and vice versa
+            (("father", "mother", "grandfather", "grandmother"),
+             {"M": "son", "F": "daughter", None: "child"}),
+            (("son", "daughter"),
+             {"M": "father", "F": "mother", None: "parent"}),
+            (("brother", "sister"),
+             {"M": "brother", "F": "sister", None: "sibling"}),
+        )
+        for term in terms
+        for gender, reciprocal in by_gender.items()
+    }
     
     def normalize(self, term: str) -> Optional[RelationInfo]:
         """Normalize a relationship term to standard form."""
-        if not term:
+        key = _lookup_key(term)
+        if key is None or len(key) < self._MIN_TERM_LEN:
             return None
-        return self.MAPPINGS.get(term.lower().strip())
+        return self.MAPPINGS.get(key)
     
     def is_known_term(self, term: str) -> bool:
         """Check if term exists in mappings."""
-        if not term:
-            return False
-        return term.lower().strip() in self.MAPPINGS
+        return _lookup_key(term) in self._KNOWN_TERMS
     
     def get_gender_for_relation(self, term: str) -> Optional[str]:
         """Get implied gender for a relationship term."""
@@ -122,15 +151,6 @@ class RelationshipMap:
         info = self.normalize(term)
         if not info:
             return "relative"
-
-        if info.relation_type == "parent_child":
-            # If the term is a parent term, reciprocal is a child term
-            if info.term in ["father", "mother", "grandfather", "grandmother"]:
-                return "son" if other_gender == "M" else "daughter" if other_gender == "F" else "child"
-            # If the term is a child term, reciprocal is a parent term
-            else:
-                return "father" if other_gender == "M" else "mother" if other_gender == "F" else "parent"
-        elif info.relation_type == "sibling":
-            return "brother" if other_gender == "M" else "sister" if other_gender == "F" else "sibling"
-
-        return info.reciprocal
+        
+        gender = other_gender if other_gender in ("M", "F") else None
+        return self._RECIPROCALS.get((info.term, gender), info.reciprocal)
@@ -1,18 +1,38 @@
 """Text processing utilities for agents."""
 
+import string
+from functools import lru_cache
 from typing import Optional
-from collections import Counter
+
+# Marker words per language, in the order languages are reported
+_LANG_KEYWORDS = {
+    'marathi': frozenset({'maza', 'mazha', 'aahe', 'bhau', 'aai', 'baba', 'kaku', 'madhe'}),
+    'hindi': frozenset({'mera', 'meri', 'hai', 'bhai', 'behen', 'mata', 'pita'}),
+    'tamil': frozenset({'enna', 'amma', 'appa', 'anna', 'akka', 'thambi', 'paati'}),
+    'telugu': frozenset({'naa', 'naaku', 'nanna', 'tammudu', 'chelli', 'ammamma'}),
+}
+
+# Punctuation and digits become word breaks before tokenizing
+_TOKEN_BREAKS = str.maketrans(string.punctuation + string.digits, ' ' * (len(string.punctuation) + 10))
+
+# Gender hints for common Indian first names
+_FEMALE_NAMES = frozenset({'padma', 'priya', 'sita', 'gita', 'radha', 'lakshmi', 'kavya', 'ananya', 'sneha', 'pooja', 'neha', 'riya'})
+_MALE_NAMES = frozenset({'ramesh', 'suresh', 'mahesh', 'rajesh', 'krishna', 'ram', 'ravi', 'anil', 'vijay', 'vishrut', 'arjun', 'amit'})
+_FEMALE_ENDINGS = ('a', 'i', 'ee', 'ya', 'devi', 'bai', 'ben')
+_MALE_ENDINGS = ('sh', 'raj', 'kumar', 'deep', 'esh', 'an', 'ar')
 
 
 class TextUtils:
     """Utilities for text processing."""
     
     @staticmethod
+    @lru_cache(maxsize=2048)
     def clean_name(name: str) -> str:
         """Clean and normalize a name."""
         if not name:
             return ""
-        return " ".join(name.split()).strip().title()
+        # split() already drops outer whitespace; title() keeps Mary-Jane / O'Brien
+        return " ".join(name.split()).title()
     
     @staticmethod
     def extract_family_name(names: list[str]) -> Optional[str]:
@@ -20,44 +40,32 @@ class TextUtils:
         if not names:
             return None
         
-        last_names = []
+        tally = {}
         for name in names:
-            parts = name.strip().split()
-            if len(parts) > 1:
-                last_names.append(parts[-1].title())
+            parts = name.rsplit(None, 1)
+            if len(parts) == 2:
+                last_name = parts[1].title()
+                tally[last_name] = tally.get(last_name, 0) + 1
         
-        if not last_names:
+        if not tally:
             return None
         
-        counts = Counter(last_names)
-        most_common = counts.most_common(1)
+        # max() keeps the first-seen name on ties, as most_common() did
+        best = max(tally, key=tally.get)
+        if tally[best] >= 2:
+            return best
         
-        if most_common and most_common[0][1] >= 2:
-            return most_common[0][0]
-        
-        return last_names[0] if last_names else None
+        # No repeats - fall back to the first last name seen
+        return next(iter(tally))
     
     @staticmethod
     def detect_language_hints(text: str) -> list[str]:
         """Detect language hints from text."""
-        text_lower = text.lower()
-        languages = []
-        
-        # Marathi
-        if any(w in text_lower for w in ['maza', 'mazha', 'aahe', 'bhau', 'aai', 'baba', 'kaku', 'madhe']):
-            languages.append('marathi')
-        
-        # Hindi
-        if any(w in text_lower for w in ['mera', 'meri', 'hai', 'bhai', 'behen', 'mata', 'pita']):
-            languages.append('hindi')
-        
-        # Tamil
-        if any(w in text_lower for w in ['enna', 'amma', 'appa', 'anna', 'akka', 'thambi', 'paati']):
-            languages.append('tamil')
-        
-        # Telugu
-        if any(w in text_lower for w in ['naa', 'naaku', 'nanna', 'tammudu', 'chelli', 'ammamma']):
-            languages.append('telugu')
+        tokens = set(text.lower().translate(_TOKEN_BREAKS).split())
+        languages = [
+            lang for lang, markers in _LANG_KEYWORDS.items()
+            if not tokens.isdisjoint(markers)
+        ]
         
         if not languages:
             languages.append('english')
@@ -70,20 +78,20 @@ class TextUtils:
         if not name:
             return None
         
-        first_name = name.lower().strip().split()[0] if name else ""
-        
-        female_names = ['padma', 'priya', 'sita', 'gita', 'radha', 'lakshmi', 'kavya', 'ananya', 'sneha', 'pooja', 'neha', 'riya']
-        male_names = ['ramesh', 'suresh', 'mahesh', 'rajesh', 'krishna', 'ram', 'ravi', 'anil', 'vijay', 'vishrut', 'arjun', 'amit']
+        parts = name.lower().split(None, 1)
+        if not parts:
+            return None
+        first_name = parts[0]
         
-        if first_name in female_names:
+        if first_name in _FEMALE_NAMES:
             return 'F'
-        if first_name in male_names:
+        if first_name in _MALE_NAMES:
             return 'M'
         
         # Check endings
-        if first_name.endswith(('a', 'i', 'ee', 'ya', 'devi', 'bai', 'ben')):
+        if first_name.endswith(_FEMALE_ENDINGS):
             return 'F'
-        if first_name.endswith(('sh', 'raj', 'kumar', 'deep', 'esh', 'an', 'ar')):
+        if first_name.endswith(_MALE_ENDINGS):
             return 'M'
         
         return None
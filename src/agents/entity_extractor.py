@@ -1,13 +1,107 @@
 """Entity extraction agent using Google ADK."""
 
 import json
+import logging
+import re
+from functools import lru_cache
 from typing import Optional
 
 from google import genai
 from google.genai import types
+from pydantic import BaseModel, Field
 
+from src.agents.adk.utils.relationship_map import RelationshipMap
 from src.config import settings
 
+try:
+    import orjson
+    _json_loads = orjson.loads  # orjson.JSONDecodeError subclasses json.JSONDecodeError
+except ImportError:
+    _json_loads = json.loads
+
+logger = logging.getLogger(__name__)
+
+# Relation terms; short text with none of these and no name-like word is not sent to the model
+_REL_TOKENS = frozenset(RelationshipMap.MAPPINGS) | {
+    "my", "mera", "meri", "maza", "mazha", "naa", "enna",
+    # Relationship verbs and plural/other English forms
+    "married", "marry", "marries", "marriage", "wed", "wedded", "engaged",
+    "spouse", "spouses", "husbands", "wives", "parent", "parents", "child",
+    "children", "kid", "kids", "sons", "daughters", "brothers", "sisters",
+    "sibling", "siblings", "grandson", "granddaughter", "grandchild",
+    "grandchildren", "grandparents", "nephew", "niece", "cousin", "cousins",
+    "family", "relative", "relatives", "friends", "colleagues",
+    # Native script: Hindi/Marathi (Devanagari), Tamil, Telugu
+    "पिता", "माता", "माँ", "मां", "बेटा", "बेटी", "भाई", "बहन", "पति", "पत्नी",
+    "दादा", "दादी", "चाचा", "मेरा", "मेरी", "मेरे", "बाबा", "आई", "भाऊ", "बहीण", "मुलगा",
+    "मुलगी", "नवरा", "बायको", "आजी", "आजोबा", "काका", "काकू", "माझा", "माझी",
+    "அப்பா", "அம்மா", "அண்ணா", "அண்ணன்", "தம்பி", "அக்கா", "தங்கை", "பாட்டி",
+    "தாத்தா", "என்", "என்னுடைய",
+    "నాన్న", "అమ్మ", "అన్న", "తమ్ముడు", "అక్క", "చెల్లి", "అమ్మమ్మ", "బాబాయ్", "నా",
+}
+# Unicode words; \w alone splits Indic words at their vowel signs and viramas
+_WORD_RE = re.compile(r"[\w\u0900-\u0dff\u200c\u200d]+")
+# Longer text goes to the model even without a known term
+_SHORT_TEXT_WORDS = 4
+
+
+def _has_name_like_word(words: list[str]) -> bool:
+    """Whether any word could be a name, place or contact detail.
+
+    Capitalized words, digits (phone numbers, ages) and words in scripts
+    without letter case all count, so only plainly generic text is skipped.
+    """
+    return any(w[0].isupper() or not w.isascii() or not w.isalpha() for w in words)
+
+
+def _can_skip(text: str) -> bool:
+    """Whether text is too short and generic to hold anything to extract."""
+    words = _WORD_RE.findall(text)
+    return (
+        len(words) <= _SHORT_TEXT_WORDS
+        and "@" not in text
+        and _REL_TOKENS.isdisjoint(w.lower() for w in words)
+        and not _has_name_like_word(words)
+    )
+
+# One client per API key, shared by all agents
+_clients: dict[str, genai.Client] = {}
+
+
+def _get_client(api_key: str) -> genai.Client:
+    """Get or create the shared Gemini client for an API key."""
+    client = _clients.get(api_key)
+    if client is None:
+        client = _clients[api_key] = genai.Client(api_key=api_key)
+    return client
+
+
+class PersonSchema(BaseModel):
+    """A person as returned by the extraction model."""
+    name: str
+    gender: Optional[str] = None
+    estimated_age: Optional[int] = None
+    birth_year: Optional[int] = None
+    location: Optional[str] = None
+    phone: Optional[str] = None
+    email: Optional[str] = None
+    interests: list[str] = Field(default_factory=list)
+
+
+class RelationshipSchema(BaseModel):
+    """A relationship; parent_child uses parent/child, others person1/person2."""
+    type: str
+    parent: Optional[str] = None
+    child: Optional[str] = None
+    person1: Optional[str] = None
+    person2: Optional[str] = None
+
+
+class ExtractionSchema(BaseModel):
+    """Structured-output schema for entity extraction."""
+    persons: list[PersonSchema] = Field(default_factory=list)
+    relationships: list[RelationshipSchema] = Field(default_factory=list)
+
 
 class EntityExtractorAgent:
     """Extract family entities and relationships from text."""
@@ -45,11 +139,30 @@ Return ONLY valid JSON in this exact format:
     ]
 }
 """
+    _PROMPT_PREFIX = EXTRACTION_PROMPT + "\n\nText to analyze:\n"
+    # Structured output mode: the reply is JSON matching ExtractionSchema
+    _CONFIG = types.GenerateContentConfig(
+        temperature=0.1,
+        max_output_tokens=2000,
+        response_mime_type="application/json",
+        response_schema=ExtractionSchema
+    )
     
     def __init__(self, api_key: Optional[str] = None):
         self.api_key = api_key or settings.google_api_key
-        self.client = genai.Client(api_key=self.api_key)
+        self.client = _get_client(self.api_key)
         self.model = "gemini-2.0-flash-exp"
+        # Repeated texts (e.g. re-submitted messages) reuse the model's reply
+        self._generate = lru_cache(maxsize=128)(self._generate_text)
+    
+    def _generate_text(self, text: str) -> str:
+        """Ask the model to extract entities from text and return its raw reply."""
+        response = self.client.models.generate_content(
+            model=self.model,
+            contents=self._PROMPT_PREFIX + text,
+            config=self._CONFIG
+        )
+        return response.text
     
     def extract_entities(self, text: str) -> dict:
         """
@@ -59,33 +172,19 @@ Return ONLY valid JSON in this exact format:
             text: Transcribed speech text
             
         Returns:
-            dict with persons, relationships
+            dict with persons, relationships ("skipped": True when the
+            text was too short and generic to send to the model)
         """
         if not text or not text.strip():
             return {"success": False, "error": "Empty text provided"}
         
+        if _can_skip(text):
+            logger.info("Skipping extraction for short text with no names or relation terms: %r", text)
+            return {"success": True, "skipped": True, "persons": [], "relationships": [], "raw_text": text}
+        
         try:
-            response = self.client.models.generate_content(
-                model=self.model,
-                contents=f"{self.EXTRACTION_PROMPT}\n\nText to analyze:\n{text}",
-                config=types.GenerateContentConfig(
-                    temperature=0.1,
-                    max_output_tokens=2000
-                )
-            )
-            
-            # Parse JSON from response
-            response_text = response.text.strip()
-            
-            # Handle markdown code blocks
-            if response_text.startswith("```json"):
-                response_text = response_text[7:]
-            if response_text.startswith("```"):
-                response_text = response_text[3:]
-            if response_text.endswith("```"):
-                response_text = response_text[:-3]
-            
-            extracted = json.loads(response_text.strip())
+            response_text = self._generate(text)
+            extracted = _json_loads(response_text)
             
             return {
                 "success": True,
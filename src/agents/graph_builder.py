@@ -1,5 +1,6 @@
 """Graph builder agent - creates family graph from extracted entities."""
 
+import sys
 from typing import Optional
 
 from src.graph.person_store import PersonStore
@@ -8,9 +9,21 @@ from src.graph.crm_store import CRMStore
 from src.models import Person
 
 
+def _norm(name: Optional[str]) -> str:
+    """Interned lookup key for a name (missing names map to "")."""
+    return sys.intern((name or "").strip().lower())
+
+
 class GraphBuilderAgent:
     """Build family graph from extracted entities."""
     
+    # relation type -> (first name key, second name key, FamilyGraph method)
+    _REL_DISPATCH = {
+        "parent_child": ("parent", "child", "add_parent_child"),
+        "spouse": ("person1", "person2", "add_spouse"),
+        "sibling": ("person1", "person2", "add_sibling"),
+    }
+    
     def __init__(
         self,
         person_store: Optional[PersonStore] = None,
@@ -65,14 +78,13 @@ class GraphBuilderAgent:
         if not name:
             return {"success": False, "error": "No name provided"}
         
-        # Check if person already exists (by name match)
-        existing = self.person_store.find_by_name(name)
+        key = _norm(name)
+        
+        # Check if person already exists (indexed case-insensitive name match)
+        existing = self.person_store.find_exact_ci(name)
         if existing:
-            # Use first exact match or close match
-            for p in existing:
-                if p.name.lower() == name.lower():
-                    self._name_to_id[name.lower()] = p.id
-                    return {"success": True, "person_id": p.id, "name": name, "existing": True}
+            self._name_to_id[key] = existing.id
+            return {"success": True, "person_id": existing.id, "name": name, "existing": True}
         
         # Create new person
         person = Person(
@@ -85,7 +97,7 @@ class GraphBuilderAgent:
         )
         
         person_id = self.person_store.add_person(person)
-        self._name_to_id[name.lower()] = person_id
+        self._name_to_id[key] = person_id
         
         # Add to CRM if contact info exists
         if person.phone or person.email:
@@ -99,46 +111,23 @@ class GraphBuilderAgent:
     
     def _create_relationship(self, rel_data: dict) -> dict:
         """Create a relationship from extracted data."""
-        rel_type = rel_data.get("type", "").lower()
+        rel_type = (rel_data.get("type") or "").lower()
         
-        if rel_type == "parent_child":
-            parent_name = rel_data.get("parent", "").lower()
-            child_name = rel_data.get("child", "").lower()
-            
-            parent_id = self._name_to_id.get(parent_name)
-            child_id = self._name_to_id.get(child_name)
-            
-            if parent_id and child_id:
-                self.family_graph.add_parent_child(parent_id, child_id)
-                return {"success": True, "type": "parent_child", "parent_id": parent_id, "child_id": child_id}
-            return {"success": False, "error": f"Could not find IDs for {parent_name} or {child_name}"}
+        dispatch = self._REL_DISPATCH.get(rel_type)
+        if dispatch is None:
+            return {"success": False, "error": f"Unknown relationship type: {rel_type}"}
         
-        elif rel_type == "spouse":
-            person1_name = rel_data.get("person1", "").lower()
-            person2_name = rel_data.get("person2", "").lower()
-            
-            person1_id = self._name_to_id.get(person1_name)
-            person2_id = self._name_to_id.get(person2_name)
-            
-            if person1_id and person2_id:
-                self.family_graph.add_spouse(person1_id, person2_id)
-                return {"success": True, "type": "spouse", "person1_id": person1_id, "person2_id": person2_id}
-            return {"success": False, "error": f"Could not find IDs for {person1_name} or {person2_name}"}
-        
-        elif rel_type == "sibling":
-            person1_name = rel_data.get("person1", "").lower()
-            person2_name = rel_data.get("person2", "").lower()
-            
-            person1_id = self._name_to_id.get(person1_name)
-            person2_id = self._name_to_id.get(person2_name)
-            
-            if person1_id and person2_id:
-                self.family_graph.add_sibling(person1_id, person2_id)
-                return {"success": True, "type": "sibling", "person1_id": person1_id, "person2_id": person2_id}
-            return {"success": False, "error": f"Could not find IDs for {person1_name} or {person2_name}"}
+        key1, key2, method = dispatch
+        name1 = _norm(rel_data.get(key1))
+        name2 = _norm(rel_data.get(key2))
+        id1 = self._name_to_id.get(name1)
+        id2 = self._name_to_id.get(name2)
         
-        return {"success": False, "error": f"Unknown relationship type: {rel_type}"}
+        if id1 and id2:
+            getattr(self.family_graph, method)(id1, id2)
+            return {"success": True, "type": rel_type, f"{key1}_id": id1, f"{key2}_id": id2}
+        return {"success": False, "error": f"Could not find IDs for {name1} or {name2}"}
     
     def get_person_id(self, name: str) -> Optional[int]:
         """Get person ID by name."""
-        return self._name_to_id.get(name.lower())
\ No newline at end of file
+        return self._name_to_id.get(_norm(name))
\ No newline at end of file
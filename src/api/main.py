@@ -1,16 +1,64 @@
 """FastAPI backend using FastMCP servers."""
 
 from fastapi import FastAPI, HTTPException
-from fastapi.responses import HTMLResponse
+from fastapi.responses import FileResponse, HTMLResponse, JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from typing import Optional, List
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from pathlib import Path
+import asyncio
+import itertools
 import json
 import traceback
 
+import httpx
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from src.mcp.client import call_nlp_tool, call_graph_tool
 
-app = FastAPI(title="Family Network API")
+
+class ORJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson when it is available."""
+
+    def render(self, content) -> bytes:
+        if orjson is None:
+            return super().render(content)
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+# Shared client for the local Ollama endpoint; keeps connections alive across requests
+_llm_client: Optional[httpx.AsyncClient] = None
+
+
+def _get_llm_client() -> httpx.AsyncClient:
+    global _llm_client
+    if _llm_client is None or _llm_client.is_closed:
+        _llm_client = httpx.AsyncClient(
+            timeout=60,
+            limits=httpx.Limits(max_connections=32, max_keepalive_connections=16),
+        )
+    return _llm_client
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    _get_llm_client()
+    yield
+    if _llm_client is not None:
+        await _llm_client.aclose()
+
+
+app = FastAPI(
+    title="Family Network API",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
+)
 
 app.add_middleware(
     CORSMiddleware,
@@ -28,14 +76,24 @@ class DeleteRequest(BaseModel):
     names: List[str]
 
 
-# Store processing logs
-processing_logs = []
+INDEX_HTML = Path(__file__).resolve().parent.parent / "ui" / "static" / "index.html"
+
+# Store processing logs (most recent MAX_LOGS, keyed by id)
+MAX_LOGS = 1000
+processing_logs: "OrderedDict[int, dict]" = OrderedDict()
+_log_ids = itertools.count(1)
+
+# Each MCP call spawns a server process; cap how many run at once
+MCP_CONCURRENCY = 8
+
+# Every graph-server process writes the same embedded GraphLite store through
+# its CLI, which is not known to tolerate concurrent writers. Graph writes run
+# one at a time across all requests; NLP calls stay concurrent.
+_graph_writes = asyncio.Semaphore(1)
 
 
 async def extract_entities_with_llm(text: str) -> dict:
     """Extract entities using Ollama."""
-    import httpx
-    
     prompt = f"""Extract family information. Return ONLY valid JSON, no explanation.
 
 Text: {text}
@@ -45,17 +103,17 @@ Format: {{"persons": [{{"name": "Full Name", "gender": "M or F", "location": "Ci
 JSON:"""
     
     try:
-        async with httpx.AsyncClient(timeout=60) as client:
-            response = await client.post(
-                "http://localhost:11434/api/generate",
-                json={"model": "llama3", "prompt": prompt, "stream": False}
-            )
-            if response.status_code == 200:
-                result_text = response.json().get("response", "")
-                start = result_text.find("{")
-                end = result_text.rfind("}") + 1
-                if start >= 0 and end > start:
-                    return json.loads(result_text[start:end])
+        response = await _get_llm_client().post(
+            "http://localhost:11434/api/generate",
+            json={"model": "llama3", "prompt": prompt, "stream": False}
+        )
+        if response.status_code == 200:
+            body = orjson.loads(response.content) if orjson else response.json()
+            result_text = body.get("response", "")
+            start = result_text.find("{")
+            end = result_text.rfind("}") + 1
+            if start >= 0 and end > start:
+                return json.loads(result_text[start:end])
     except Exception as e:
         print(f"LLM error: {e}")
     return {"persons": [], "relationships": []}
@@ -80,50 +138,78 @@ async def process_family_text(text: str) -> dict:
         results["errors"].append(f"llm_extraction: {e}")
         extracted = {"persons": [], "relationships": []}
     
-    # Step 3: Process persons via MCP
-    for p in extracted.get("persons", []):
-        name = p.get("name", "")
-        if not name:
-            continue
-        
-        try:
-            gender = p.get("gender")
-            if not gender:
+    # Step 3: Process persons via MCP (gender lookups concurrent, graph writes serialized)
+    sem = asyncio.Semaphore(MCP_CONCURRENCY)
+
+    async def add_person(p: dict) -> tuple:
+        name = p["name"]
+        steps = []
+        gender = p.get("gender")
+        if not gender:
+            async with sem:
                 g = await call_nlp_tool("infer_gender", {"name": name})
-                gender = g.get("gender") if g else None
-                results["steps"].append({"tool": "infer_gender", "input": name, "output": g})
-            
+            gender = g.get("gender") if g else None
+            steps.append({"tool": "infer_gender", "input": name, "output": g})
+
+        async with _graph_writes:
             result = await call_graph_tool("add_person", {
                 "name": name, 
                 "gender": gender,
                 "family_name": p.get("family_name"),
                 "location": p.get("location")
             })
-            results["persons"].append({"name": name, "result": result})
-            results["steps"].append({"tool": "add_person", "input": name, "output": result})
-        except Exception as e:
-            results["errors"].append(f"add_person({name}): {e}")
+        steps.append({"tool": "add_person", "input": name, "output": result})
+        return steps, result
+
+    # One add_person (and infer_gender) call per distinct whitespace/case-normalized
+    # name, so "Ravi Kumar" and "ravi  kumar" never become two people. Later
+    # mentions only fill fields the first one left empty.
+    unique = {}
+    for p in extracted.get("persons", []):
+        if p.get("name"):
+            key = " ".join(p["name"].split()).lower()
+            if key in unique:
+                unique[key] = {**p, **{k: v for k, v in unique[key].items() if v}}
+            else:
+                unique[key] = p
+    persons = list(unique.values())
+    outcomes = await asyncio.gather(*(add_person(p) for p in persons), return_exceptions=True)
+    for p, outcome in zip(persons, outcomes):
+        name = p["name"]
+        if isinstance(outcome, Exception):
+            results["errors"].append(f"add_person({name}): {outcome}")
+            continue
+        steps, result = outcome
+        if isinstance(result, dict) and result.get("success") is False:
+            results["errors"].append(f"add_person({name}): {result.get('error', 'failed')}")
+        results["persons"].append({"name": name, "result": result})
+        results["steps"].extend(steps)
     
-    # Step 4: Process relationships via MCP
+    # Step 4: Process relationships via MCP (after all persons exist)
+    async def add_relationship(t: str, p1: str, p2: str):
+        async with _graph_writes:
+            if t == "spouse":
+                return await call_graph_tool("add_spouse", {"person1": p1, "person2": p2})
+            if t == "parent_child":
+                return await call_graph_tool("add_parent_child", {"parent": p1, "child": p2})
+            return await call_graph_tool("add_sibling", {"person1": p1, "person2": p2})
+
+    rels = []
     for rel in extracted.get("relationships", []):
         t = rel.get("type", "").lower()
         p1, p2 = rel.get("person1", ""), rel.get("person2", "")
-        if not p1 or not p2:
+        if p1 and p2 and t in ("spouse", "parent_child", "sibling"):
+            rels.append((t, p1, p2))
+
+    outcomes = await asyncio.gather(*(add_relationship(*r) for r in rels), return_exceptions=True)
+    for (t, p1, p2), r in zip(rels, outcomes):
+        if isinstance(r, Exception):
+            results["errors"].append(f"add_relationship({p1}->{p2}): {r}")
             continue
-        
-        try:
-            if t == "spouse":
-                r = await call_graph_tool("add_spouse", {"person1": p1, "person2": p2})
-            elif t == "parent_child":
-                r = await call_graph_tool("add_parent_child", {"parent": p1, "child": p2})
-            elif t == "sibling":
-                r = await call_graph_tool("add_sibling", {"person1": p1, "person2": p2})
-            else:
-                continue
-            results["relationships"].append({"from": p1, "to": p2, "type": t, "result": r})
-            results["steps"].append({"tool": f"add_{t}", "input": f"{p1} -> {p2}", "output": r})
-        except Exception as e:
-            results["errors"].append(f"add_relationship({p1}->{p2}): {e}")
+        if isinstance(r, dict) and r.get("success") is False:
+            results["errors"].append(f"add_relationship({p1}->{p2}): {r.get('error', 'failed')}")
+        results["relationships"].append({"from": p1, "to": p2, "type": t, "result": r})
+        results["steps"].append({"tool": f"add_{t}", "input": f"{p1} -> {p2}", "output": r})
     
     return results
 
@@ -136,12 +222,14 @@ async def process_text(req: ProcessRequest):
         # Store log
         import datetime
         log_entry = {
-            "id": len(processing_logs) + 1,
+            "id": next(_log_ids),
             "timestamp": datetime.datetime.now().isoformat(),
             "input": req.text,
             "result": result
         }
-        processing_logs.append(log_entry)
+        if len(processing_logs) >= MAX_LOGS:
+            processing_logs.popitem(last=False)
+        processing_logs[log_entry["id"]] = log_entry
 
         return {"success": True, "data": result, "log_id": log_entry["id"]}
     except Exception as e:
@@ -167,20 +255,18 @@ async def get_relationships():
 
 @app.get("/api/logs")
 async def get_logs():
-    return {"logs": processing_logs}
+    return {"logs": list(processing_logs.values())}
 
 
 @app.delete("/api/logs/{log_id}")
 async def delete_log(log_id: int):
-    global processing_logs
-    processing_logs = [l for l in processing_logs if l["id"] != log_id]
+    processing_logs.pop(log_id, None)
     return {"success": True}
 
 
 @app.delete("/api/logs")
 async def clear_logs():
-    global processing_logs
-    processing_logs = []
+    processing_logs.clear()
     return {"success": True}
 
 
@@ -201,4 +287,5 @@ async def delete_persons(req: DeleteRequest):
 
 @app.get("/", response_class=HTMLResponse)
 async def index():
-    return open("src/ui/static/index.html").read()
+    # FileResponse stats/streams off the event loop (sendfile where supported)
+    return FileResponse(INDEX_HTML, media_type="text/html")
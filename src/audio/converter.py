@@ -1,28 +1,63 @@
 """Audio format conversion utilities."""
 
-import io
+import struct
+import subprocess
 from pathlib import Path
-from typing import Union
+from typing import List, Union
 
-from pydub import AudioSegment
+
+FFMPEG = "ffmpeg"
+FFPROBE = "ffprobe"
+
+
+def _data_offset(wav: bytes) -> int:
+    """Offset of the WAV ``data`` chunk header, or -1 if there is none."""
+    if len(wav) < 12 or wav[:4] != b"RIFF":
+        return -1
+    pos = 12
+    while pos + 8 <= len(wav):
+        if wav[pos:pos + 4] == b"data":
+            return pos
+        (size,) = struct.unpack_from("<I", wav, pos + 4)
+        pos += 8 + size + (size & 1)
+    return -1
+
+
+def _fix_wav_sizes(wav: bytes) -> bytes:
+    """Fill in the RIFF/data sizes ffmpeg leaves unset when writing to a pipe."""
+    pos = _data_offset(wav)
+    if pos < 0:
+        return wav
+    buf = bytearray(wav)
+    struct.pack_into("<I", buf, 4, len(buf) - 8)
+    struct.pack_into("<I", buf, pos + 4, len(buf) - pos - 8)
+    return bytes(buf)
 
 
 class AudioConverter:
     """Convert between audio formats."""
-    
+
     def __init__(self, target_sample_rate: int = 16000):
         self.target_sample_rate = target_sample_rate
-    
+
+    def _wav_args(self) -> List[str]:
+        """Output options: mono PCM WAV at the target rate, no metadata."""
+        return [
+            "-vn", "-ac", "1", "-ar", str(self.target_sample_rate),
+            "-map_metadata", "-1", "-f", "wav",
+        ]
+
+    def _to_wav(self, audio_bytes: bytes, format: str = "webm") -> bytes:
+        """Decode audio bytes through a single ffmpeg pipe."""
+        cmd = [FFMPEG, "-loglevel", "error", "-f", format, "-i", "pipe:0"]
+        cmd += self._wav_args() + ["pipe:1"]
+        result = subprocess.run(cmd, input=audio_bytes, capture_output=True, check=True)
+        return _fix_wav_sizes(result.stdout)
+
     def webm_to_wav(self, webm_data: bytes) -> bytes:
         """Convert WebM audio bytes to WAV bytes."""
-        audio = AudioSegment.from_file(io.BytesIO(webm_data), format="webm")
-        audio = audio.set_channels(1)
-        audio = audio.set_frame_rate(self.target_sample_rate)
-        
-        wav_buffer = io.BytesIO()
-        audio.export(wav_buffer, format="wav")
-        return wav_buffer.getvalue()
-    
+        return self._to_wav(webm_data, format="webm")
+
     def webm_to_wav_file(
         self,
         webm_path: Union[str, Path],
@@ -31,15 +66,26 @@ class AudioConverter:
         """Convert WebM file to WAV file."""
         webm_path = Path(webm_path)
         wav_path = Path(wav_path)
-        
-        audio = AudioSegment.from_file(str(webm_path), format="webm")
-        audio = audio.set_channels(1)
-        audio = audio.set_frame_rate(self.target_sample_rate)
-        audio.export(str(wav_path), format="wav")
-        
+
+        cmd = [FFMPEG, "-loglevel", "error", "-y", "-i", str(webm_path)]
+        cmd += self._wav_args() + [str(wav_path)]
+        subprocess.run(cmd, capture_output=True, check=True)
+
         return wav_path
-    
+
     def get_duration(self, audio_bytes: bytes, format: str = "webm") -> float:
         """Get duration of audio in seconds."""
-        audio = AudioSegment.from_file(io.BytesIO(audio_bytes), format=format)
-        return len(audio) / 1000.0
\ No newline at end of file
+        cmd = [
+            FFPROBE, "-v", "error", "-f", format, "-i", "pipe:0",
+            "-show_entries", "format=duration", "-of", "csv=p=0",
+        ]
+        result = subprocess.run(cmd, input=audio_bytes, capture_output=True, check=True)
+        try:
+            return float(result.stdout.strip())
+        except ValueError:
+            # Browser-recorded WebM often carries no duration header; decode it.
+            wav = self._to_wav(audio_bytes, format=format)
+            pos = _data_offset(wav)
+            if pos < 0:
+                return 0.0
+            return (len(wav) - pos - 8) / (2 * self.target_sample_rate)
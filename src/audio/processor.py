@@ -1,34 +1,116 @@
 """Audio processing with noise removal."""
 
-import io
-import wave
+import struct
+import threading
 from pathlib import Path
 from typing import Union
 
 import numpy as np
-import noisereduce as nr
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def _wav_header(data_size: int, sample_rate: int) -> bytes:
+    """44-byte header for mono 16-bit PCM WAV data."""
+    return struct.pack(
+        '<4sI4s4sIHHIIHH4sI',
+        b'RIFF', 36 + data_size, b'WAVE',
+        b'fmt ', 16, 1, 1, sample_rate, sample_rate * 2, 2, 16,
+        b'data', data_size,
+    )
+
+
+def _pcm_frames(buf: memoryview) -> memoryview:
+    """Slice the sample data out of a WAV buffer; raw PCM passes through."""
+    if buf[:4] != b'RIFF' or buf[8:12] != b'WAVE':
+        return buf
+    pos = 12
+    while pos + 8 <= len(buf):
+        size = int.from_bytes(buf[pos + 4:pos + 8], 'little')
+        if buf[pos:pos + 4] == b'data':
+            # Streamed WAVs may leave the size unset (0 or 0xFFFFFFFF)
+            end = len(buf) if size in (0, 0xFFFFFFFF) else pos + 8 + size
+            return buf[pos + 8:end]
+        pos += 8 + size + (size & 1)
+    raise ValueError("WAV data chunk not found")
 
 
 class AudioProcessor:
     """Process audio: noise removal and normalization."""
     
+    # Spectral subtraction settings
+    NFFT = 512                # 32 ms frames at 16 kHz
+    HOP = NFFT // 2           # 50% overlap; periodic Hann sums to 1
+    NOISE_SECONDS = 0.2       # leading audio assumed to be noise
+    NOISE_EMA = 0.3           # weight of the newest noise estimate
+    OVERSUBTRACT = 1.5        # alpha: how much noise magnitude to remove
+    SPECTRAL_FLOOR = 0.2      # beta: keep at least this much of each bin
+    
     def __init__(self, sample_rate: int = 16000):
         self.sample_rate = sample_rate
+        n = np.arange(self.NFFT)
+        self._window = (0.5 - 0.5 * np.cos(2 * np.pi * n / self.NFFT)).astype(np.float32)
+        # Per-bin noise magnitude, carried across calls. Keep one processor
+        # per audio source (e.g. per connection) so profiles don't mix.
+        self._noise_mag: np.ndarray | None = None
+        self._noise_lock = threading.Lock()
+        # Reusable encode buffers, grown on demand; per thread so a processor
+        # shared with an executor never hands two callers the same scratch
+        self._scratch = threading.local()
+    
+    def _stft(self, audio: np.ndarray) -> tuple[np.ndarray, int]:
+        """Windowed rFFT of overlapping frames, plus the padded length."""
+        pad = self.NFFT - self.HOP
+        n_frames = -(-(len(audio) + pad) // self.HOP)
+        padded = np.zeros((n_frames + 1) * self.HOP, dtype=np.float32)
+        padded[pad:pad + len(audio)] = audio
+        frames = sliding_window_view(padded, self.NFFT)[::self.HOP]
+        return np.fft.rfft(frames * self._window, axis=1), len(padded)
+    
+    def _update_noise(self, noise_mag: np.ndarray) -> np.ndarray:
+        """Fold a new noise estimate into the running average."""
+        with self._noise_lock:
+            if self._noise_mag is None:
+                self._noise_mag = noise_mag
+            else:
+                self._noise_mag = (1 - self.NOISE_EMA) * self._noise_mag + self.NOISE_EMA * noise_mag
+            return self._noise_mag
     
     def remove_noise(
         self,
         audio_data: np.ndarray,
         noise_clip: np.ndarray | None = None
     ) -> np.ndarray:
-        """Remove background noise from audio."""
-        reduced = nr.reduce_noise(
-            y=audio_data,
-            sr=self.sample_rate,
-            y_noise=noise_clip,
-            prop_decrease=0.8,
-            stationary=noise_clip is None
-        )
-        return reduced
+        """Remove background noise from audio by spectral subtraction.
+        
+        The noise profile comes from noise_clip when given, otherwise from
+        the first NOISE_SECONDS of the audio, and is averaged across calls.
+        """
+        audio = np.asarray(audio_data, dtype=np.float32).reshape(-1)
+        if audio.size == 0:
+            return audio_data
+        
+        spec, padded_len = self._stft(audio)
+        mag = np.abs(spec)
+        
+        if noise_clip is not None and len(noise_clip):
+            noise_mag = np.abs(self._stft(np.asarray(noise_clip, dtype=np.float32))[0]).mean(axis=0)
+        else:
+            lead = max(1, int(self.NOISE_SECONDS * self.sample_rate) // self.HOP)
+            noise_mag = mag[:lead].mean(axis=0)
+        noise_mag = self._update_noise(noise_mag)
+        
+        # Half-wave rectified subtraction with a spectral floor; keep noisy phase
+        clean = np.maximum(mag - self.OVERSUBTRACT * noise_mag, self.SPECTRAL_FLOOR * mag)
+        spec *= clean / np.maximum(mag, 1e-10)
+        frames = np.fft.irfft(spec, n=self.NFFT, axis=1)
+        
+        # Overlap-add: each HOP block is the tail of one frame plus the head of the next
+        blocks = np.zeros((len(frames) + 1, self.HOP), dtype=np.float32)
+        blocks[:-1] += frames[:, :self.HOP]
+        blocks[1:] += frames[:, self.HOP:]
+        pad = self.NFFT - self.HOP
+        out = blocks.reshape(-1)[pad:pad + audio.size]
+        return out.reshape(np.shape(audio_data)).astype(audio_data.dtype, copy=False)
     
     def normalize(self, audio_data: np.ndarray) -> np.ndarray:
         """Normalize audio to -1 to 1 range."""
@@ -37,21 +119,31 @@ class AudioProcessor:
             return audio_data / max_val
         return audio_data
     
-    def bytes_to_numpy(self, audio_bytes: bytes) -> np.ndarray:
-        """Convert WAV bytes to numpy array."""
-        with io.BytesIO(audio_bytes) as buf:
-            with wave.open(buf, 'rb') as wav:
-                frames = wav.readframes(wav.getnframes())
-                audio = np.frombuffer(frames, dtype=np.int16)
-                return audio.astype(np.float32) / 32768.0
+    def bytes_to_numpy(self, audio_bytes) -> np.ndarray:
+        """Convert WAV (or headerless 16-bit PCM) bytes to numpy array.
+        
+        Accepts any buffer (bytes, bytearray, memoryview); samples are read
+        in place rather than copied out through the wave module.
+        """
+        frames = _pcm_frames(memoryview(audio_bytes).cast('B'))
+        audio = np.frombuffer(frames[:len(frames) & ~1], dtype='<i2')
+        # Widen and scale in a single pass
+        return np.multiply(audio, np.float32(1 / 32768.0), dtype=np.float32)
+    
+    def _encode_buffers(self, n: int) -> tuple[np.ndarray, np.ndarray]:
+        """Scratch float32/int16 buffers of length n for the calling thread."""
+        local = self._scratch
+        f32 = getattr(local, 'f32', None)
+        if f32 is None or f32.size < n:
+            local.f32 = np.empty(n, dtype=np.float32)
+            local.i16 = np.empty(n, dtype='<i2')
+        return local.f32[:n], local.i16[:n]
     
     def numpy_to_bytes(self, audio_data: np.ndarray) -> bytes:
         """Convert numpy array to WAV bytes."""
-        audio_int16 = (audio_data * 32767).astype(np.int16)
-        buf = io.BytesIO()
-        with wave.open(buf, 'wb') as wav:
-            wav.setnchannels(1)
-            wav.setsampwidth(2)
-            wav.setframerate(self.sample_rate)
-            wav.writeframes(audio_int16.tobytes())
-        return buf.getvalue()
\ No newline at end of file
+        scratch, audio_int16 = self._encode_buffers(audio_data.size)
+        np.multiply(audio_data.reshape(-1), 32767.0, out=scratch, casting='same_kind')
+        np.rint(scratch, out=scratch)
+        # Saturate instead of wrapping when the input overshoots [-1, 1]
+        np.clip(scratch, -32768, 32767, out=audio_int16, casting='unsafe')
+        return _wav_header(audio_int16.nbytes, self.sample_rate) + audio_int16.tobytes()
\ No newline at end of file
@@ -6,6 +6,9 @@ import numpy as np
 class AudioValidator:
     """Validate audio quality and parameters."""
     
+    SILENCE_RMS = 0.01   # below this RMS the audio counts as silent
+    CLIP_LEVEL = 0.99    # any sample above this magnitude counts as clipped
+    
     def __init__(
         self,
         min_duration: float = 1.0,
@@ -19,8 +22,9 @@ class AudioValidator:
     def validate(self, audio_data: np.ndarray) -> dict:
         """Validate audio and return status with details."""
         duration = len(audio_data) / self.sample_rate
-        is_silent = self._is_silent(audio_data)
-        is_clipped = self._is_clipped(audio_data)
+        rms, peak = self._scan(audio_data)
+        is_silent = rms < self.SILENCE_RMS
+        is_clipped = peak > self.CLIP_LEVEL
         
         errors = []
         if duration < self.min_duration:
@@ -40,11 +44,11 @@ class AudioValidator:
             "errors": errors
         }
     
-    def _is_silent(self, audio: np.ndarray, threshold: float = 0.01) -> bool:
-        """Check if audio is mostly silent."""
-        rms = np.sqrt(np.mean(audio ** 2))
-        return rms < threshold
-    
-    def _is_clipped(self, audio: np.ndarray, threshold: float = 0.99) -> bool:
-        """Check if audio has clipping."""
-        return np.any(np.abs(audio) > threshold)
\ No newline at end of file
+    def _scan(self, audio: np.ndarray) -> tuple[float, float]:
+        """RMS and peak absolute level, without temporary arrays."""
+        audio = np.asarray(audio).reshape(-1)
+        if audio.size == 0:
+            return 0.0, 0.0
+        rms = float(np.sqrt(np.dot(audio, audio) / audio.size))
+        peak = float(max(audio.max(), -audio.min()))
+        return rms, peak
\ No newline at end of file
@@ -3,6 +3,8 @@
 import asyncio
 import base64
 import json
+import os
+from concurrent.futures import ThreadPoolExecutor
 from typing import Callable, Optional
 
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
@@ -10,18 +12,35 @@ from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 from src.audio.processor import AudioProcessor
 from src.audio.validator import AudioValidator
 
+# Binary frames: first byte is the message type, the rest is payload
+FRAME_AUDIO_CHUNK = 0
+FRAME_AUDIO_END = 1
+FRAME_PING = 2
+_FRAME_TYPES = {
+    FRAME_AUDIO_CHUNK: "audio_chunk",
+    FRAME_AUDIO_END: "audio_end",
+    FRAME_PING: "ping",
+}
+
 
 class AudioWebSocketServer:
     """Handle WebSocket connections for audio streaming."""
     
+    # Audio chunks acknowledged per ack frame
+    ACK_BATCH = 32
+    
     def __init__(
         self,
         on_audio_complete: Optional[Callable] = None,
         sample_rate: int = 16000
     ):
         self.on_audio_complete = on_audio_complete
-        self.processor = AudioProcessor(sample_rate=sample_rate)
+        self.sample_rate = sample_rate
         self.validator = AudioValidator(sample_rate=sample_rate)
+        # Noise removal is numpy/FFT work that releases the GIL; keep it off the event loop
+        self._noise_pool = ThreadPoolExecutor(
+            max_workers=min(4, os.cpu_count() or 1), thread_name_prefix="noise"
+        )
         self.app = FastAPI(title="Family Network Audio Server")
         self._setup_routes()
     
@@ -37,40 +56,70 @@ class AudioWebSocketServer:
             return {"status": "ok"}
     
     async def _handle_connection(self, websocket: WebSocket):
-        """Handle a single WebSocket connection."""
+        """Handle a single WebSocket connection.
+        
+        Accepts binary frames (see FRAME_*) as well as the JSON text
+        messages with base64 audio used by older clients.
+        """
         await websocket.accept()
-        audio_chunks: list[bytes] = []
+        # Per-connection processor: its running noise profile belongs to this client
+        processor = AudioProcessor(sample_rate=self.sample_rate)
+        audio_buf = bytearray()
+        pending_acks = 0
         
         try:
             while True:
-                message = await websocket.receive_text()
-                data = json.loads(message)
+                message = await websocket.receive()
+                if message["type"] == "websocket.disconnect":
+                    break
+                
+                raw = message.get("bytes")
+                if raw is not None:
+                    # Binary frame: payload is the audio bytes as-is, no JSON/base64 decoding
+                    if not raw:
+                        continue
+                    msg_type = _FRAME_TYPES.get(raw[0])
+                    payload = memoryview(raw)[1:]
+                else:
+                    data = json.loads(message["text"])
+                    msg_type = data["type"]
+                    payload = base64.b64decode(data["data"]) if msg_type == "audio_chunk" else None
                 
-                if data["type"] == "audio_chunk":
-                    chunk = base64.b64decode(data["data"])
-                    audio_chunks.append(chunk)
-                    await websocket.send_json({"type": "ack"})
+                if msg_type == "audio_chunk":
+                    audio_buf += payload
+                    pending_acks += 1
+                    if pending_acks >= self.ACK_BATCH:
+                        await websocket.send_json({"type": "ack", "count": pending_acks})
+                        pending_acks = 0
+                    continue
                 
-                elif data["type"] == "audio_end":
-                    result = await self._process_audio(audio_chunks)
+                # Flush outstanding acks so replies stay in order
+                if pending_acks:
+                    await websocket.send_json({"type": "ack", "count": pending_acks})
+                    pending_acks = 0
+                
+                if msg_type == "audio_end":
+                    result = await self._process_audio(audio_buf, processor)
                     await websocket.send_json(result)
-                    audio_chunks = []
+                    audio_buf = bytearray()
                 
-                elif data["type"] == "ping":
+                elif msg_type == "ping":
                     await websocket.send_json({"type": "pong"})
         
         except WebSocketDisconnect:
             pass
     
-    async def _process_audio(self, chunks: list[bytes]) -> dict:
+    def _clean(self, processor: AudioProcessor, audio_data):
+        """Denoise and normalize (runs in the noise pool)."""
+        return processor.normalize(processor.remove_noise(audio_data))
+    
+    async def _process_audio(self, audio_buf: bytearray, processor: AudioProcessor) -> dict:
         """Process collected audio chunks."""
-        if not chunks:
+        if not audio_buf:
             return {"type": "error", "message": "No audio received"}
         
-        combined = b"".join(chunks)
-        
         try:
-            audio_data = self.processor.bytes_to_numpy(combined)
+            audio_data = processor.bytes_to_numpy(audio_buf)
             validation = self.validator.validate(audio_data)
             
             if not validation["valid"]:
@@ -80,8 +129,8 @@ class AudioWebSocketServer:
                 }
             
             # Remove noise
-            cleaned = self.processor.remove_noise(audio_data)
-            cleaned = self.processor.normalize(cleaned)
+            loop = asyncio.get_running_loop()
+            cleaned = await loop.run_in_executor(self._noise_pool, self._clean, processor, audio_data)
             
             # Callback if provided
             if self.on_audio_complete:
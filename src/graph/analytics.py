@@ -36,16 +36,23 @@ class FamilyAnalytics:
     
     def calculate_all_degree_centrality(self, person_ids: list[int]) -> dict[int, int]:
         """Calculate degree centrality for all persons."""
-        return {pid: self.degree_centrality(pid) for pid in person_ids}
+        counts = self.graph.batch_connection_counts(person_ids)
+        return {pid: counts.get(pid, 0) for pid in person_ids}
     
     def find_most_connected(self, person_ids: list[int], top_n: int = 5) -> list[dict]:
         """Find the most connected family members."""
-        centralities = self.calculate_all_degree_centrality(person_ids)
+        return self._most_connected(self.calculate_all_degree_centrality(person_ids), top_n)
+    
+    def _most_connected(self, centralities: dict[int, int], top_n: int) -> list[dict]:
+        """Top-N entries of precomputed centralities, with names and connections."""
         sorted_ids = sorted(centralities.keys(), key=lambda x: centralities[x], reverse=True)
         
+        top_ids = sorted_ids[:top_n]
+        persons = self.person_store.get_persons(top_ids)
+        
         results = []
-        for pid in sorted_ids[:top_n]:
-            person = self.person_store.get_person(pid)
+        for pid in top_ids:
+            person = persons.get(pid)
             results.append({
                 "person_id": pid,
                 "name": person.name if person else "Unknown",
@@ -59,26 +66,19 @@ class FamilyAnalytics:
         Find persons who connect different family branches.
         These are typically spouses who link two families.
         """
-        bridges = []
+        spouse_map = self.graph.find_marriage_bridges(person_ids)
+        persons = self.person_store.get_persons(spouse_map)
         
+        bridges = []
         for pid in person_ids:
-            spouses = self.graph.get_spouse(pid)
-            if spouses:
-                # Person with spouse from different family branch
-                my_parents = set(self.graph.get_parents(pid))
-                
-                for spouse_id in spouses:
-                    spouse_parents = set(self.graph.get_parents(spouse_id))
-                    
-                    # If spouse has different parents, this is a bridge
-                    if my_parents and spouse_parents and not my_parents.intersection(spouse_parents):
-                        person = self.person_store.get_person(pid)
-                        bridges.append({
-                            "person_id": pid,
-                            "name": person.name if person else "Unknown",
-                            "spouse_id": spouse_id,
-                            "type": "marriage_bridge"
-                        })
+            person = persons.get(pid)
+            for spouse_id in spouse_map.get(pid, ()):
+                bridges.append({
+                    "person_id": pid,
+                    "name": person.name if person else "Unknown",
+                    "spouse_id": spouse_id,
+                    "type": "marriage_bridge"
+                })
         
         return bridges
     
@@ -97,33 +97,33 @@ class FamilyAnalytics:
     
     def _count_generations_up(self, person_id: int, max_depth: int = 10) -> int:
         """Count generations above a person."""
-        depth = 0
-        current = {person_id}
-        
-        for _ in range(max_depth):
-            parents = set()
-            for pid in current:
-                parents.update(self.graph.get_parents(pid))
-            if not parents:
-                break
-            depth += 1
-            current = parents
-        
-        return depth
+        return self._count_generations(person_id, self.graph.get_parents, max_depth)
     
     def _count_generations_down(self, person_id: int, max_depth: int = 10) -> int:
         """Count generations below a person."""
+        return self._count_generations(person_id, self.graph.get_children, max_depth)
+    
+    def _count_generations(self, person_id: int, step, max_depth: int) -> int:
+        """Longest chain of step() hops from a person, up to max_depth.
+        
+        A person reached again on a later level (cousin marriages, cycles in
+        bad data) is looked up only once.
+        """
         depth = 0
         current = {person_id}
+        seen: dict[int, list[int]] = {}
         
         for _ in range(max_depth):
-            children = set()
+            next_gen = set()
             for pid in current:
-                children.update(self.graph.get_children(pid))
-            if not children:
+                related = seen.get(pid)
+                if related is None:
+                    related = seen[pid] = step(pid)
+                next_gen.update(related)
+            if not next_gen:
                 break
             depth += 1
-            current = children
+            current = next_gen
         
         return depth
     
@@ -132,12 +132,13 @@ class FamilyAnalytics:
         if not person_ids:
             return {"error": "No persons provided"}
         
-        total_connections = sum(self.degree_centrality(pid) for pid in person_ids)
+        centralities = self.calculate_all_degree_centrality(person_ids)
+        total_connections = sum(centralities.values())
         
         return {
             "total_members": len(person_ids),
             "total_connections": total_connections // 2,  # Divide by 2 since bidirectional
             "avg_connections_per_person": round(total_connections / len(person_ids), 2),
-            "most_connected": self.find_most_connected(person_ids, top_n=3),
+            "most_connected": self._most_connected(centralities, top_n=3),
             "bridges": self.find_bridges(person_ids)
         }
\ No newline at end of file
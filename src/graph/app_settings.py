@@ -7,18 +7,47 @@ Author: Shrinivas Deshpande
 Date: December 20, 2025
 """
 
+import atexit
 import json
+import os
+import tempfile
+import threading
+import weakref
 from pathlib import Path
 from typing import Optional
 
 
+# Live instances, flushed together at exit without keeping any of them alive
+_instances: "weakref.WeakSet[AppSettings]" = weakref.WeakSet()
+
+
+def _flush_all():
+    """Write every live instance's pending changes."""
+    for settings in list(_instances):
+        settings._flush()
+
+
+atexit.register(_flush_all)
+
+
 class AppSettings:
     """Manage application settings with JSON file persistence."""
 
+    # Writes are coalesced: the file is saved once changes stop for this long
+    SAVE_DELAY = 0.1
+
     def __init__(self, settings_file: str = "data/app_settings.json"):
         self.settings_file = Path(settings_file)
         self.settings_file.parent.mkdir(parents=True, exist_ok=True)
+        # Another instance may still hold unsaved changes to the same file
+        for other in list(_instances):
+            if other.settings_file.resolve() == self.settings_file.resolve():
+                other._flush()
         self._settings = self._load()
+        self._lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+        self._dirty = False
+        _instances.add(self)
 
     def _load(self) -> dict:
         """Load settings from JSON file."""
@@ -31,13 +60,41 @@ class AppSettings:
         return {}
 
     def _save(self):
-        """Save settings to JSON file."""
+        """Save settings to JSON file (atomically, via a temp file)."""
         try:
-            with open(self.settings_file, 'w') as f:
-                json.dump(self._settings, f, indent=2)
-        except IOError as e:
+            fd, tmp = tempfile.mkstemp(dir=self.settings_file.parent, suffix=".tmp")
+            try:
+                with os.fdopen(fd, 'w') as f:
+                    # Shallow copy: set() may run on another thread mid-dump
+                    json.dump(dict(self._settings), f, indent=2)
+                os.replace(tmp, self.settings_file)
+            except BaseException:
+                os.unlink(tmp)
+                raise
+        except (IOError, OSError) as e:
             print(f"Error saving settings: {e}")
 
+    def _mark_dirty(self):
+        """Schedule a save once changes stop arriving."""
+        with self._lock:
+            self._dirty = True
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(self.SAVE_DELAY, self._flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _flush(self):
+        """Write pending changes now, if any."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._dirty:
+                return
+            self._dirty = False
+            self._save()
+
     def get_home_temple_id(self) -> Optional[int]:
         """Get the saved home temple ID."""
         temple_id = self._settings.get("home_temple_id")
@@ -49,7 +106,7 @@ class AppSettings:
             self._settings.pop("home_temple_id", None)
         else:
             self._settings["home_temple_id"] = temple_id
-        self._save()
+        self._mark_dirty()
 
     def get(self, key: str, default=None):
         """Get a setting value."""
@@ -58,4 +115,4 @@ class AppSettings:
     def set(self, key: str, value):
         """Set a setting value."""
         self._settings[key] = value
-        self._save()
+        self._mark_dirty()
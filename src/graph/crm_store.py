@@ -1,11 +1,13 @@
 """CRM database for contacts and engagement tracking."""
 
 import sqlite3
+import threading
 from pathlib import Path
 from datetime import datetime
 from typing import Optional
 
 from src.config import settings
+from src.graph.crm_store_v2 import CONNECTION_PRAGMAS
 
 
 class CRMStore:
@@ -14,11 +16,28 @@ class CRMStore:
     def __init__(self, db_path: Optional[str] = None):
         self.db_path = db_path or settings.database.crm_db_path
         Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
         self._init_db()
     
+    def _connect(self) -> sqlite3.Connection:
+        """Return this thread's connection, opening it with the pragmas on first use.
+        
+        Used as ``with self._connect() as conn`` the block still commits or
+        rolls back, but the connection itself stays open for reuse.
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path)
+            conn.row_factory = sqlite3.Row
+            for pragma in CONNECTION_PRAGMAS:
+                conn.execute(pragma)
+            self._local.conn = conn
+        return conn
+    
     def _init_db(self):
         """Initialize CRM schema."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS contacts (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -49,10 +68,44 @@ class CRMStore:
             """)
             conn.execute("CREATE INDEX IF NOT EXISTS idx_contact_person ON contacts(person_id)")
             conn.execute("CREATE INDEX IF NOT EXISTS idx_interest_person ON interests(person_id)")
+            self._fts = self._init_interest_fts(conn)
+    
+    def _init_interest_fts(self, conn: sqlite3.Connection) -> bool:
+        """Create the trigram FTS5 index over interests; False if unavailable."""
+        exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'interests_fts'"
+        ).fetchone()
+        if exists:
+            return True
+        try:
+            # trigram tokens let MATCH answer substring queries from the index
+            conn.execute("""
+                CREATE VIRTUAL TABLE interests_fts USING fts5(
+                    interest, content='interests', content_rowid='id', tokenize='trigram'
+                )
+            """)
+        except sqlite3.OperationalError:
+            return False
+        conn.executescript("""
+            CREATE TRIGGER IF NOT EXISTS interests_fts_ai AFTER INSERT ON interests BEGIN
+                INSERT INTO interests_fts(rowid, interest) VALUES (new.id, new.interest);
+            END;
+            CREATE TRIGGER IF NOT EXISTS interests_fts_ad AFTER DELETE ON interests BEGIN
+                INSERT INTO interests_fts(interests_fts, rowid, interest)
+                VALUES ('delete', old.id, old.interest);
+            END;
+            CREATE TRIGGER IF NOT EXISTS interests_fts_au AFTER UPDATE OF interest ON interests BEGIN
+                INSERT INTO interests_fts(interests_fts, rowid, interest)
+                VALUES ('delete', old.id, old.interest);
+                INSERT INTO interests_fts(rowid, interest) VALUES (new.id, new.interest);
+            END;
+            INSERT INTO interests_fts(interests_fts) VALUES ('rebuild');
+        """)
+        return True
     
     def add_contact(self, person_id: int, phone: str = None, email: str = None) -> int:
         """Add or update contact info for a person."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             existing = conn.execute(
                 "SELECT id FROM contacts WHERE person_id = ?", (person_id,)
             ).fetchone()
@@ -72,8 +125,7 @@ class CRMStore:
     
     def get_contact(self, person_id: int) -> Optional[dict]:
         """Get contact info for a person."""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
+        with self._connect() as conn:
             row = conn.execute(
                 "SELECT * FROM contacts WHERE person_id = ?", (person_id,)
             ).fetchone()
@@ -81,7 +133,7 @@ class CRMStore:
     
     def add_interaction(self, person_id: int, interaction_type: str, notes: str = None) -> int:
         """Log an interaction with a person."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.execute("""
                 INSERT INTO interactions (person_id, interaction_type, notes)
                 VALUES (?, ?, ?)
@@ -90,8 +142,7 @@ class CRMStore:
     
     def get_interactions(self, person_id: int) -> list[dict]:
         """Get all interactions for a person."""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
+        with self._connect() as conn:
             rows = conn.execute(
                 "SELECT * FROM interactions WHERE person_id = ? ORDER BY created_at DESC",
                 (person_id,)
@@ -100,7 +151,7 @@ class CRMStore:
     
     def add_interest(self, person_id: int, interest: str) -> bool:
         """Add an interest for a person."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             try:
                 conn.execute(
                     "INSERT INTO interests (person_id, interest) VALUES (?, ?)",
@@ -112,7 +163,7 @@ class CRMStore:
     
     def get_interests(self, person_id: int) -> list[str]:
         """Get all interests for a person."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             rows = conn.execute(
                 "SELECT interest FROM interests WHERE person_id = ?", (person_id,)
             ).fetchall()
@@ -120,11 +171,20 @@ class CRMStore:
     
     def find_by_interest(self, interest: str) -> list[int]:
         """Find all person IDs with a given interest."""
-        with sqlite3.connect(self.db_path) as conn:
-            rows = conn.execute(
-                "SELECT person_id FROM interests WHERE interest LIKE ?",
-                (f"%{interest.lower()}%",)
-            ).fetchall()
+        interest = interest.lower()
+        with self._connect() as conn:
+            # Trigram MATCH needs at least 3 characters; shorter terms scan
+            if self._fts and len(interest) >= 3:
+                rows = conn.execute("""
+                    SELECT person_id FROM interests WHERE id IN (
+                        SELECT rowid FROM interests_fts WHERE interests_fts MATCH ?
+                    ) ORDER BY id
+                """, ('"' + interest.replace('"', '""') + '"',)).fetchall()
+            else:
+                rows = conn.execute(
+                    "SELECT person_id FROM interests WHERE interest LIKE ?",
+                    (f"%{interest}%",)
+                ).fetchall()
             return [row[0] for row in rows]
     
     def find_by_location(self, location: str) -> list[int]:
@@ -24,6 +24,17 @@ from src.graph.models_v2 import PersonProfileV2, Donation
 # Shared database path - same DB as FamilyRegistry
 DEFAULT_DB_PATH = "data/crm/crm_v2.db"
 
+# SQL expression matching PersonProfileV2.full_name (indexed for name lookups)
+FULL_NAME_SQL = "TRIM(first_name || ' ' || IFNULL(last_name, ''))"
+
+# Per-connection tuning; WAL itself is persistent and set once in _init_db
+CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA busy_timeout=5000",
+)
+
 
 class CRMStoreV2:
     """Storage for person profiles and donations."""
@@ -33,9 +44,17 @@ class CRMStoreV2:
         Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
         self._init_db()
     
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection with the write-throughput pragmas applied."""
+        conn = sqlite3.connect(self.db_path)
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        return conn
+    
     def _init_db(self):
         """Initialize profiles and donations tables."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
             # Profiles table
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS profiles (
@@ -117,6 +136,7 @@ class CRMStoreV2:
             conn.execute("CREATE INDEX IF NOT EXISTS idx_profile_family_id ON profiles(family_id)")
             conn.execute("CREATE INDEX IF NOT EXISTS idx_profile_family_code ON profiles(family_code)")
             conn.execute("CREATE INDEX IF NOT EXISTS idx_profile_name ON profiles(last_name, first_name)")
+            conn.execute(f"CREATE INDEX IF NOT EXISTS idx_profile_full_name ON profiles({FULL_NAME_SQL})")
             conn.execute("CREATE INDEX IF NOT EXISTS idx_profile_city ON profiles(city)")
             conn.execute("CREATE INDEX IF NOT EXISTS idx_profile_occupation ON profiles(occupation)")
             conn.execute("CREATE INDEX IF NOT EXISTS idx_donation_person ON donations(person_id)")
@@ -125,6 +145,21 @@ class CRMStoreV2:
             conn.execute("CREATE INDEX IF NOT EXISTS idx_relationship_person1 ON relationships(person1_id)")
             conn.execute("CREATE INDEX IF NOT EXISTS idx_relationship_person2 ON relationships(person2_id)")
             conn.execute("CREATE INDEX IF NOT EXISTS idx_relationship_type ON relationships(relation_type)")
+            # Change counter bumped by triggers, so callers can cache profile reads
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS profiles_version (
+                    id INTEGER PRIMARY KEY CHECK (id = 1),
+                    version INTEGER NOT NULL
+                )
+            """)
+            conn.execute("INSERT OR IGNORE INTO profiles_version (id, version) VALUES (1, 0)")
+            for trigger, event in (("ins", "INSERT"), ("del", "DELETE"), ("upd", "UPDATE")):
+                conn.execute(f"""
+                    CREATE TRIGGER IF NOT EXISTS profiles_version_{trigger} AFTER {event} ON profiles
+                    BEGIN
+                        UPDATE profiles_version SET version = version + 1 WHERE id = 1;
+                    END
+                """)
     
     # =========================================================================
     # PROFILE OPERATIONS (CRUD)
@@ -136,33 +171,91 @@ class CRMStoreV2:
         
         Returns: ID of created profile
         """
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute("""
-                INSERT INTO profiles (
-                    family_id, family_uuid, family_code,
-                    first_name, last_name, gender, birth_year, occupation,
-                    phone, email, preferred_currency,
-                    city, state, country,
-                    gothra, nakshatra,
-                    religious_interests, spiritual_interests, social_interests, hobbies,
-                    notes
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                profile.family_id, profile.family_uuid, profile.family_code,
-                profile.first_name, profile.last_name, profile.gender,
-                profile.birth_year, profile.occupation,
-                profile.phone, profile.email, profile.preferred_currency,
-                profile.city, profile.state, profile.country,
-                profile.gothra, profile.nakshatra,
-                profile.religious_interests, profile.spiritual_interests,
-                profile.social_interests, profile.hobbies,
-                profile.notes
-            ))
-            return cursor.lastrowid
+        with self._connect() as conn:
+            return self._insert_profile(conn, profile)
+    
+    def add_persons(self, profiles: List[PersonProfileV2]) -> List[int]:
+        """
+        Add several profiles in one transaction.
+        
+        Returns: IDs of created profiles, in input order
+        """
+        with self._connect() as conn:
+            return [self._insert_profile(conn, profile) for profile in profiles]
+    
+    def upsert_persons(self, profiles: List[PersonProfileV2]) -> List[tuple]:
+        """
+        Add several profiles in one transaction, reusing existing matches.
+        
+        A profile matches an existing one when first name, last name and
+        family code are equal (names compared case-insensitively). Existing
+        profiles are loaded once per family code and matched in memory.
+        
+        Returns: List of (person_id, existing) tuples in input order
+        """
+        results = []
+        with self._connect() as conn:
+            known = {}  # (family_code, first, last) -> earliest matching ID
+            for family_code in {profile.family_code or "" for profile in profiles}:
+                if family_code:
+                    rows = conn.execute("""
+                        SELECT id, first_name, last_name FROM profiles
+                        WHERE family_code = ? AND is_archived = 0
+                        ORDER BY id
+                    """, (family_code,))
+                else:
+                    rows = conn.execute("""
+                        SELECT id, first_name, last_name FROM profiles
+                        WHERE (family_code IS NULL OR family_code = '') AND is_archived = 0
+                        ORDER BY id
+                    """)
+                for person_id, first_name, last_name in rows:
+                    key = (family_code, first_name.lower(), (last_name or "").lower())
+                    known.setdefault(key, person_id)
+            
+            for profile in profiles:
+                key = (
+                    profile.family_code or "",
+                    profile.first_name.lower(),
+                    (profile.last_name or "").lower(),
+                )
+                person_id = known.get(key)
+                if person_id:
+                    results.append((person_id, True))
+                else:
+                    person_id = self._insert_profile(conn, profile)
+                    known[key] = person_id
+                    results.append((person_id, False))
+        return results
+    
+    def _insert_profile(self, conn: sqlite3.Connection, profile: PersonProfileV2) -> int:
+        """Insert one profile on an open connection and return its ID."""
+        cursor = conn.execute("""
+            INSERT INTO profiles (
+                family_id, family_uuid, family_code,
+                first_name, last_name, gender, birth_year, occupation,
+                phone, email, preferred_currency,
+                city, state, country,
+                gothra, nakshatra,
+                religious_interests, spiritual_interests, social_interests, hobbies,
+                notes
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, (
+            profile.family_id, profile.family_uuid, profile.family_code,
+            profile.first_name, profile.last_name, profile.gender,
+            profile.birth_year, profile.occupation,
+            profile.phone, profile.email, profile.preferred_currency,
+            profile.city, profile.state, profile.country,
+            profile.gothra, profile.nakshatra,
+            profile.religious_interests, profile.spiritual_interests,
+            profile.social_interests, profile.hobbies,
+            profile.notes
+        ))
+        return cursor.lastrowid
     
     def get_person(self, person_id: int) -> Optional[PersonProfileV2]:
         """Get person by ID."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             conn.row_factory = sqlite3.Row
             row = conn.execute(
                 "SELECT * FROM profiles WHERE id = ?",
@@ -187,7 +280,7 @@ class CRMStoreV2:
         set_clause = ", ".join(f"{k} = ?" for k in kwargs.keys())
         values = list(kwargs.values()) + [person_id]
         
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.execute(
                 f"UPDATE profiles SET {set_clause} WHERE id = ?",
                 values
@@ -200,7 +293,7 @@ class CRMStoreV2:
         
         Returns: True if deleted
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             # Donations deleted via CASCADE, but explicit for clarity
             conn.execute("DELETE FROM donations WHERE person_id = ?", (person_id,))
             cursor = conn.execute("DELETE FROM profiles WHERE id = ?", (person_id,))
@@ -218,10 +311,15 @@ class CRMStoreV2:
     # PROFILE QUERIES
     # =========================================================================
     
+    def get_version(self) -> int:
+        """Counter that changes whenever any writer adds, deletes or updates a profile."""
+        with self._connect() as conn:
+            return conn.execute("SELECT version FROM profiles_version WHERE id = 1").fetchone()[0]
+    
     def get_all(self, include_archived: bool = False) -> List[PersonProfileV2]:
         """Get all persons."""
         where = "1=1" if include_archived else "is_archived = 0"
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             conn.row_factory = sqlite3.Row
             rows = conn.execute(
                 f"SELECT * FROM profiles WHERE {where} ORDER BY family_code, last_name, first_name"
@@ -281,7 +379,7 @@ class CRMStoreV2:
         
         where_clause = " AND ".join(conditions) if conditions else "1=1"
         
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             conn.row_factory = sqlite3.Row
             rows = conn.execute(
                 f"SELECT * FROM profiles WHERE {where_clause} ORDER BY family_code, last_name, first_name",
@@ -289,13 +387,43 @@ class CRMStoreV2:
             ).fetchall()
             return [self._row_to_profile(row) for row in rows]
     
+    def get_ids_by_names(self, names: List[str]) -> dict:
+        """
+        Resolve full names to person IDs with a single indexed query.
+        
+        Args:
+            names: Full names to look up (exact match, archived excluded)
+            
+        Returns: Dict mapping full name -> ID of the first matching profile
+        """
+        names = list(dict.fromkeys(name for name in names if name))
+        if not names:
+            return {}
+        
+        rows = []
+        with self._connect() as conn:
+            # Chunk to stay under SQLite's bound-parameter limit
+            for start in range(0, len(names), 500):
+                chunk = names[start:start + 500]
+                placeholders = ", ".join("?" * len(chunk))
+                rows.extend(conn.execute(f"""
+                    SELECT id, {FULL_NAME_SQL} FROM profiles
+                    WHERE {FULL_NAME_SQL} IN ({placeholders}) AND is_archived = 0
+                    ORDER BY family_code, last_name, first_name
+                """, chunk).fetchall())
+        
+        name_to_id = {}
+        for person_id, full_name in rows:
+            name_to_id.setdefault(full_name, person_id)
+        return name_to_id
+    
     def get_by_family(self, family_code: str) -> List[PersonProfileV2]:
         """Get all persons in a family."""
         return self.search(family_code=family_code)
     
     def get_family_codes(self) -> List[str]:
         """Get distinct family codes (for dropdowns)."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             rows = conn.execute("""
                 SELECT DISTINCT family_code FROM profiles 
                 WHERE family_code IS NOT NULL AND family_code != '' AND is_archived = 0
@@ -313,7 +441,7 @@ class CRMStoreV2:
         
         Returns: ID of created donation
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.execute("""
                 INSERT INTO donations (
                     person_id, amount, currency, cause, deity,
@@ -328,7 +456,7 @@ class CRMStoreV2:
     
     def get_donation(self, donation_id: int) -> Optional[Donation]:
         """Get donation by ID."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             conn.row_factory = sqlite3.Row
             row = conn.execute(
                 "SELECT * FROM donations WHERE id = ?",
@@ -344,7 +472,7 @@ class CRMStoreV2:
         set_clause = ", ".join(f"{k} = ?" for k in kwargs.keys())
         values = list(kwargs.values()) + [donation_id]
         
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.execute(
                 f"UPDATE donations SET {set_clause} WHERE id = ?",
                 values
@@ -353,7 +481,7 @@ class CRMStoreV2:
     
     def delete_donation(self, donation_id: int) -> bool:
         """Delete a donation."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.execute(
                 "DELETE FROM donations WHERE id = ?",
                 (donation_id,)
@@ -366,7 +494,7 @@ class CRMStoreV2:
     
     def get_donations_for_person(self, person_id: int) -> List[Donation]:
         """Get all donations for a person."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             conn.row_factory = sqlite3.Row
             rows = conn.execute(
                 "SELECT * FROM donations WHERE person_id = ? ORDER BY donation_date DESC",
@@ -376,7 +504,7 @@ class CRMStoreV2:
     
     def get_donations_by_cause(self, cause: str) -> List[dict]:
         """Get donations by cause with person info."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             conn.row_factory = sqlite3.Row
             rows = conn.execute("""
                 SELECT d.*, p.first_name, p.last_name, p.family_code
@@ -394,7 +522,7 @@ class CRMStoreV2:
     
     def get_donations_by_deity(self, deity: str) -> List[dict]:
         """Get donations by deity with person info."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             conn.row_factory = sqlite3.Row
             rows = conn.execute("""
                 SELECT d.*, p.first_name, p.last_name, p.family_code
@@ -412,7 +540,7 @@ class CRMStoreV2:
     
     def get_donation_summary(self, person_id: int) -> dict:
         """Get donation summary for a person."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             rows = conn.execute("""
                 SELECT currency, COUNT(*) as count, SUM(amount) as total
                 FROM donations 
@@ -483,7 +611,7 @@ class CRMStoreV2:
 
     def get_all_persons(self) -> List[PersonProfileV2]:
         """Get all persons from the database."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             conn.row_factory = sqlite3.Row
             cursor = conn.execute("""
                 SELECT * FROM profiles WHERE is_archived = 0
@@ -518,7 +646,7 @@ class CRMStoreV2:
 
         Returns: ID of created relationship
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.execute("""
                 INSERT INTO relationships (
                     person1_id, person2_id, relation_type, relation_term, notes
@@ -526,13 +654,37 @@ class CRMStoreV2:
             """, (person1_id, person2_id, relation_type, relation_term, notes))
             return cursor.lastrowid
 
+    def add_relationships(self, relationships: List[dict]) -> int:
+        """
+        Add several relationships in one transaction.
+
+        Args:
+            relationships: List of dicts with person1_id, person2_id,
+                relation_type and optional relation_term / notes
+
+        Returns: Number of relationships created
+        """
+        with self._connect() as conn:
+            cursor = conn.executemany("""
+                INSERT INTO relationships (
+                    person1_id, person2_id, relation_type, relation_term, notes
+                ) VALUES (?, ?, ?, ?, ?)
+            """, [
+                (
+                    rel["person1_id"], rel["person2_id"], rel["relation_type"],
+                    rel.get("relation_term"), rel.get("notes")
+                )
+                for rel in relationships
+            ])
+            return cursor.rowcount
+
     def get_relationships(self, person_id: int) -> List[dict]:
         """
         Get all relationships for a person.
 
         Returns: List of dicts with relationship info
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             conn.row_factory = sqlite3.Row
             rows = conn.execute("""
                 SELECT * FROM relationships
@@ -543,7 +695,7 @@ class CRMStoreV2:
 
     def get_children(self, person_id: int) -> List[int]:
         """Get IDs of all children of a person."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             rows = conn.execute("""
                 SELECT person2_id FROM relationships
                 WHERE person1_id = ? AND relation_type = 'parent_child'
@@ -552,7 +704,7 @@ class CRMStoreV2:
 
     def get_spouses(self, person_id: int) -> List[int]:
         """Get IDs of all spouses of a person."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             rows = conn.execute("""
                 SELECT person2_id FROM relationships
                 WHERE person1_id = ? AND relation_type = 'spouse'
@@ -564,7 +716,7 @@ class CRMStoreV2:
 
     def get_siblings(self, person_id: int) -> List[int]:
         """Get IDs of all siblings of a person."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             rows = conn.execute("""
                 SELECT person2_id FROM relationships
                 WHERE person1_id = ? AND relation_type = 'sibling'
@@ -576,6 +728,6 @@ class CRMStoreV2:
 
     def delete_relationship(self, relationship_id: int) -> bool:
         """Delete a relationship."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             conn.execute("DELETE FROM relationships WHERE id = ?", (relationship_id,))
             return True
@@ -7,6 +7,8 @@ from datetime import datetime
 from typing import Optional
 from dataclasses import dataclass, field
 
+from src.graph.crm_store_v2 import CONNECTION_PRAGMAS
+
 
 @dataclass
 class PersonProfile:
@@ -40,6 +42,10 @@ class PersonProfile:
         return f"{self.first_name} {self.last_name}".strip()
 
 
+# SQL for PersonProfile.full_name; queries must repeat it verbatim to use idx_full_name
+FULL_NAME_SQL = "trim(first_name || ' ' || ifnull(last_name, ''))"
+
+
 class EnhancedCRM:
     """Enhanced CRM with structured fields."""
     
@@ -48,8 +54,16 @@ class EnhancedCRM:
         Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
         self._init_db()
     
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection with the write-throughput pragmas applied."""
+        conn = sqlite3.connect(self.db_path)
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        return conn
+    
     def _init_db(self):
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS profiles (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -86,9 +100,12 @@ class EnhancedCRM:
             conn.execute("CREATE INDEX IF NOT EXISTS idx_name ON profiles(first_name, last_name)")
             conn.execute("CREATE INDEX IF NOT EXISTS idx_city ON profiles(city)")
             conn.execute("CREATE INDEX IF NOT EXISTS idx_family ON profiles(family_id)")
+            conn.execute(
+                f"CREATE INDEX IF NOT EXISTS idx_full_name ON profiles({FULL_NAME_SQL} COLLATE NOCASE)"
+            )
     
     def add_person(self, profile: PersonProfile) -> int:
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.execute("""
                 INSERT INTO profiles (
                     first_name, last_name, gender, age, phone, email, preferred_currency,
@@ -107,7 +124,7 @@ class EnhancedCRM:
             return cursor.lastrowid
     
     def get_person(self, person_id: int) -> Optional[PersonProfile]:
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             conn.row_factory = sqlite3.Row
             row = conn.execute("SELECT * FROM profiles WHERE id = ?", (person_id,)).fetchone()
             return self._row_to_profile(row) if row else None
@@ -121,12 +138,12 @@ class EnhancedCRM:
         set_clause = ", ".join(f"{k} = ?" for k in kwargs.keys())
         values = list(kwargs.values()) + [person_id]
         
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.execute(f"UPDATE profiles SET {set_clause} WHERE id = ?", values)
             return cursor.rowcount > 0
     
     def delete_person(self, person_id: int) -> bool:
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.execute("DELETE FROM profiles WHERE id = ?", (person_id,))
             return cursor.rowcount > 0
     
@@ -152,17 +169,28 @@ class EnhancedCRM:
         
         where = " AND ".join(conditions) if conditions else "1=1"
         
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             conn.row_factory = sqlite3.Row
             rows = conn.execute(f"SELECT * FROM profiles WHERE {where}", params).fetchall()
             return [self._row_to_profile(row) for row in rows]
     
+    def find_by_full_name_ci(self, name: str) -> Optional[PersonProfile]:
+        """Find the earliest active profile whose full name matches, ignoring case."""
+        with self._connect() as conn:
+            conn.row_factory = sqlite3.Row
+            row = conn.execute(
+                f"SELECT * FROM profiles WHERE {FULL_NAME_SQL} = ? COLLATE NOCASE "
+                "AND is_archived = 0 ORDER BY id LIMIT 1",
+                (name.strip(),)
+            ).fetchone()
+            return self._row_to_profile(row) if row else None
+    
     def get_all(self, include_archived: bool = False) -> list[PersonProfile]:
         return self.search(include_archived=include_archived)
     
     # Family management
     def create_family(self, name: str, description: str = "") -> int:
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.execute(
                 "INSERT INTO families (name, description) VALUES (?, ?)",
                 (name, description)
@@ -170,7 +198,7 @@ class EnhancedCRM:
             return cursor.lastrowid
     
     def get_families(self, include_archived: bool = False) -> list[dict]:
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             conn.row_factory = sqlite3.Row
             where = "" if include_archived else "WHERE is_archived = 0"
             rows = conn.execute(f"SELECT * FROM families {where}").fetchall()
@@ -178,7 +206,7 @@ class EnhancedCRM:
     
     def archive_family(self, family_id: int) -> int:
         """Archive entire family."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             conn.execute("UPDATE families SET is_archived = 1 WHERE id = ?", (family_id,))
             cursor = conn.execute("UPDATE profiles SET is_archived = 1 WHERE family_id = ?", (family_id,))
             return cursor.rowcount
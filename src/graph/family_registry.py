@@ -107,27 +107,64 @@ class FamilyRegistry:
         Returns:
             Family object with generated code and UUID
         """
+        with sqlite3.connect(self.db_path) as conn:
+            return self._insert_family(conn, surname, city, description)
+    
+    def create_families(self, families: List[dict]) -> List[Family]:
+        """
+        Create several families in a single transaction.
+        
+        Args:
+            families: List of dicts with "surname", "city" and optional "description"
+            
+        Returns:
+            Created Family objects, in the same order as the input
+        """
+        with sqlite3.connect(self.db_path) as conn:
+            return [
+                self._insert_family(
+                    conn,
+                    family["surname"],
+                    family["city"],
+                    family.get("description", "")
+                )
+                for family in families
+            ]
+    
+    def _insert_family(
+        self,
+        conn: sqlite3.Connection,
+        surname: str,
+        city: str,
+        description: str
+    ) -> Family:
+        """Insert one family on an open connection and return it."""
         surname_norm = self._normalize_for_code(surname)
         city_norm = self._normalize_for_code(city)[:3]
-        sequence = self._get_next_sequence(surname_norm, city_norm)
+        
+        # Sequence is read on the same connection so earlier inserts in a batch count
+        result = conn.execute("""
+            SELECT MAX(sequence) FROM families 
+            WHERE surname = ? AND city = ?
+        """, (surname_norm, city_norm)).fetchone()
+        sequence = (result[0] or 0) + 1
         
         family_uuid = str(uuid.uuid4())
         family_code = f"{surname_norm}-{city_norm}-{sequence:03d}"
         
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute("""
-                INSERT INTO families (uuid, code, surname, city, sequence, description)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """, (family_uuid, family_code, surname_norm, city_norm, sequence, description))
-            
-            return Family(
-                id=cursor.lastrowid,
-                uuid=family_uuid,
-                code=family_code,
-                surname=surname,
-                city=city,
-                description=description
-            )
+        cursor = conn.execute("""
+            INSERT INTO families (uuid, code, surname, city, sequence, description)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, (family_uuid, family_code, surname_norm, city_norm, sequence, description))
+        
+        return Family(
+            id=cursor.lastrowid,
+            uuid=family_uuid,
+            code=family_code,
+            surname=surname,
+            city=city,
+            description=description
+        )
     
     def get_by_id(self, family_id: int) -> Optional[Family]:
         """Get family by ID."""
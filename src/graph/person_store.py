@@ -2,12 +2,19 @@
 
 import sqlite3
 import json
+from difflib import SequenceMatcher, get_close_matches
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Optional
 from datetime import date, datetime
 
+try:
+    from rapidfuzz import fuzz, process
+except ImportError:
+    process = None
+
 from src.models import Person
 from src.config import settings
+from src.graph.crm_store_v2 import CONNECTION_PRAGMAS
 
 
 class PersonStore:
@@ -17,10 +24,19 @@ class PersonStore:
         self.db_path = db_path or settings.database.persons_db_path
         Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
         self._init_db()
+        self._names_snapshot: tuple[tuple[str, ...], tuple[int, ...], int] = ((), (), -1)
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection with the write-throughput pragmas applied."""
+        conn = sqlite3.connect(self.db_path)
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        return conn
     
     def _init_db(self):
         """Initialize database schema."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS persons (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -35,11 +51,27 @@ class PersonStore:
                 )
             """)
             conn.execute("CREATE INDEX IF NOT EXISTS idx_name ON persons(name)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_name_nocase ON persons(name COLLATE NOCASE)")
             conn.execute("CREATE INDEX IF NOT EXISTS idx_phone ON persons(phone)")
+            # Change counter bumped by triggers, so every writer invalidates snapshots
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS persons_version (
+                    id INTEGER PRIMARY KEY CHECK (id = 1),
+                    version INTEGER NOT NULL
+                )
+            """)
+            conn.execute("INSERT OR IGNORE INTO persons_version (id, version) VALUES (1, 0)")
+            for trigger, event in (("ins", "INSERT"), ("del", "DELETE"), ("upd", "UPDATE OF name")):
+                conn.execute(f"""
+                    CREATE TRIGGER IF NOT EXISTS persons_version_{trigger} AFTER {event} ON persons
+                    BEGIN
+                        UPDATE persons_version SET version = version + 1 WHERE id = 1;
+                    END
+                """)
     
     def add_person(self, person: Person) -> int:
         """Add a person and return their ID."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.execute("""
                 INSERT INTO persons (name, gender, birth_date, phone, email, location, interests)
                 VALUES (?, ?, ?, ?, ?, ?, ?)
@@ -56,7 +88,7 @@ class PersonStore:
     
     def get_person(self, person_id: int) -> Optional[Person]:
         """Get person by ID."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             conn.row_factory = sqlite3.Row
             row = conn.execute(
                 "SELECT * FROM persons WHERE id = ?", (person_id,)
@@ -66,18 +98,96 @@ class PersonStore:
                 return self._row_to_person(row)
             return None
     
+    def get_persons(self, person_ids: Iterable[int]) -> dict[int, Person]:
+        """Get several persons by ID in one query, keyed by ID."""
+        ids = list(set(person_ids))
+        if not ids:
+            return {}
+        
+        placeholders = ", ".join("?" * len(ids))
+        with self._connect() as conn:
+            conn.row_factory = sqlite3.Row
+            rows = conn.execute(
+                f"SELECT * FROM persons WHERE id IN ({placeholders})", ids
+            ).fetchall()
+            return {row["id"]: self._row_to_person(row) for row in rows}
+    
     def find_by_name(self, name: str) -> list[Person]:
         """Find persons by name (partial match)."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             conn.row_factory = sqlite3.Row
             rows = conn.execute(
                 "SELECT * FROM persons WHERE name LIKE ?", (f"%{name}%",)
             ).fetchall()
             return [self._row_to_person(row) for row in rows]
     
+    def find_exact_ci(self, name: str) -> Optional[Person]:
+        """Find the earliest person whose name matches exactly, ignoring case."""
+        with self._connect() as conn:
+            conn.row_factory = sqlite3.Row
+            row = conn.execute(
+                "SELECT * FROM persons WHERE name = ? COLLATE NOCASE ORDER BY id LIMIT 1",
+                (name,)
+            ).fetchone()
+            return self._row_to_person(row) if row else None
+    
+    def find_closest(self, name: str, score_cutoff: float = 90.0,
+                     margin: float = 5.0) -> Optional[Person]:
+        """Find the person whose name best matches, tolerating misspellings.
+        
+        Uses RapidFuzz's WRatio when installed, otherwise difflib. Returns None
+        unless exactly one name scores within margin of the best, so a near
+        tie (e.g. "Anil Kumar" vs "Anil Kumari") is never guessed.
+        
+        Args:
+            name: Name to look up
+            score_cutoff: Minimum similarity (0-100) for a match
+            margin: How far (0-100) the runner-up must trail the best match
+        """
+        names, ids, _ = self.all_names_snapshot()
+        query = name.lower().strip()
+        if process is not None:
+            scored = [(score, position) for _, score, position in process.extract(
+                query, names, scorer=fuzz.WRatio, score_cutoff=score_cutoff, limit=2)]
+        else:
+            scored = []
+            for candidate in get_close_matches(query, names, n=2, cutoff=score_cutoff / 100):
+                ratio = SequenceMatcher(None, query, candidate).ratio()
+                scored.append((ratio * 100, names.index(candidate)))
+        if not scored or (len(scored) > 1 and scored[1][0] > scored[0][0] - margin):
+            return None
+        return self.get_person(ids[scored[0][1]])
+    
+    def get_version(self) -> int:
+        """Counter that changes whenever any writer adds, deletes or renames a person."""
+        with self._connect() as conn:
+            return conn.execute("SELECT version FROM persons_version WHERE id = 1").fetchone()[0]
+    
+    def all_names_snapshot(self) -> tuple[tuple[str, ...], tuple[int, ...], int]:
+        """Lowercased names, their earliest IDs, and the version they were read at.
+        
+        Cached until the version changes, so repeated fuzzy lookups reuse the
+        same tuples instead of re-reading every name.
+        """
+        version = self.get_version()
+        if self._names_snapshot[2] != version:
+            index = self.get_name_index()
+            self._names_snapshot = (tuple(index), tuple(index.values()), version)
+        return self._names_snapshot
+    
+    def get_name_index(self) -> dict[str, int]:
+        """Map each lowercased name to the ID of its earliest person."""
+        with self._connect() as conn:
+            rows = conn.execute("SELECT id, name FROM persons ORDER BY id").fetchall()
+        
+        index = {}
+        for person_id, name in rows:
+            index.setdefault(name.lower(), person_id)
+        return index
+    
     def find_by_phone(self, phone: str) -> Optional[Person]:
         """Find person by phone number."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             conn.row_factory = sqlite3.Row
             row = conn.execute(
                 "SELECT * FROM persons WHERE phone = ?", (phone,)
@@ -100,7 +210,7 @@ class PersonStore:
         set_clause = ", ".join(f"{k} = ?" for k in updates.keys())
         values = list(updates.values()) + [person_id]
         
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.execute(
                 f"UPDATE persons SET {set_clause} WHERE id = ?", values
             )
@@ -108,7 +218,7 @@ class PersonStore:
     
     def get_all(self) -> list[Person]:
         """Get all persons."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             conn.row_factory = sqlite3.Row
             rows = conn.execute("SELECT * FROM persons").fetchall()
             return [self._row_to_person(row) for row in rows]
@@ -128,6 +238,6 @@ class PersonStore:
     
     def delete_person(self, person_id: int) -> bool:
         """Delete a person by ID."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.execute("DELETE FROM persons WHERE id = ?", (person_id,))
             return cursor.rowcount > 0
\ No newline at end of file
@@ -518,3 +518,72 @@ class PronounResolver:
             needs_disambiguation=False,
             error=f"Cannot resolve pronoun '{pronoun}' without more context. Please use the person's name instead."
         )
+
+
+def match_person(query: str, similarity_threshold: float = 0.75,
+                 phone_hint: Optional[str] = None,
+                 context_person_id: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Fuzzy-match a person and return a JSON-ready dict.
+
+    This is the in-process equivalent of the /tools/fuzzy_match_person
+    endpoint, which delegates here.
+
+    Returns:
+        dict with best match, all matches, and reasoning
+    """
+    try:
+        matcher = FuzzyPersonMatcher(
+            similarity_threshold=similarity_threshold
+        )
+
+        result = matcher.find_person(
+            query=query,
+            phone_hint=phone_hint,
+            context_person_id=context_person_id
+        )
+
+        # Convert to dict for JSON response
+        response = {
+            "success": result.success,
+            "query": result.query,
+            "best_match": {
+                "person_id": result.best_match.person_id,
+                "full_name": result.best_match.full_name,
+                "phone": result.best_match.phone,
+                "email": result.best_match.email,
+                "city": result.best_match.city,
+                "similarity_score": result.best_match.similarity_score,
+                "match_reason": result.best_match.match_reason,
+                "confidence": result.best_match.confidence
+            } if result.best_match else None,
+            "all_matches": [
+                {
+                    "person_id": m.person_id,
+                    "full_name": m.full_name,
+                    "phone": m.phone,
+                    "email": m.email,
+                    "city": m.city,
+                    "similarity_score": m.similarity_score,
+                    "match_reason": m.match_reason,
+                    "confidence": m.confidence
+                }
+                for m in result.all_matches
+            ],
+            "reasoning": result.reasoning,
+            "needs_disambiguation": result.needs_disambiguation,
+            "error": result.error
+        }
+
+        return response
+
+    except Exception as e:
+        return {
+            "success": False,
+            "query": query,
+            "best_match": None,
+            "all_matches": [],
+            "reasoning": [f"Error during fuzzy matching: {str(e)}"],
+            "needs_disambiguation": False,
+            "error": str(e)
+        }
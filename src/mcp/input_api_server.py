@@ -7,7 +7,7 @@ from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel
 
 from src.agents.adk.orchestrator import FamilyOrchestrator
-from src.mcp.fuzzy_matcher import FuzzyPersonMatcher, PronounResolver
+from src.mcp.fuzzy_matcher import PronounResolver, match_person
 
 # Create FastAPI app
 app = FastAPI(title="Family Network Input API", version="1.0.0")
@@ -178,61 +178,12 @@ def fuzzy_match_person(request: FuzzyMatchRequest) -> dict:
     Returns:
         dict with best match, all matches, and reasoning
     """
-    try:
-        matcher = FuzzyPersonMatcher(
-            similarity_threshold=request.similarity_threshold
-        )
-
-        result = matcher.find_person(
-            query=request.query,
-            phone_hint=request.phone_hint,
-            context_person_id=request.context_person_id
-        )
-
-        # Convert to dict for JSON response
-        response = {
-            "success": result.success,
-            "query": result.query,
-            "best_match": {
-                "person_id": result.best_match.person_id,
-                "full_name": result.best_match.full_name,
-                "phone": result.best_match.phone,
-                "email": result.best_match.email,
-                "city": result.best_match.city,
-                "similarity_score": result.best_match.similarity_score,
-                "match_reason": result.best_match.match_reason,
-                "confidence": result.best_match.confidence
-            } if result.best_match else None,
-            "all_matches": [
-                {
-                    "person_id": m.person_id,
-                    "full_name": m.full_name,
-                    "phone": m.phone,
-                    "email": m.email,
-                    "city": m.city,
-                    "similarity_score": m.similarity_score,
-                    "match_reason": m.match_reason,
-                    "confidence": m.confidence
-                }
-                for m in result.all_matches
-            ],
-            "reasoning": result.reasoning,
-            "needs_disambiguation": result.needs_disambiguation,
-            "error": result.error
-        }
-
-        return response
-
-    except Exception as e:
-        return {
-            "success": False,
-            "query": request.query,
-            "best_match": None,
-            "all_matches": [],
-            "reasoning": [f"Error during fuzzy matching: {str(e)}"],
-            "needs_disambiguation": False,
-            "error": str(e)
-        }
+    return match_person(
+        query=request.query,
+        similarity_threshold=request.similarity_threshold,
+        phone_hint=request.phone_hint,
+        context_person_id=request.context_person_id
+    )
 
 
 @app.post("/tools/resolve_pronoun")
@@ -11,8 +11,8 @@ Architecture:
     Agent → MCP Protocol → crm_server.py → Data Layer → SQLite
 
 Tools are organized by domain:
-- Family tools: create_family, get_family, list_families
-- Profile tools: add_person, get_person, update_person, search_persons
+- Family tools: create_family, bulk_create_families, get_family, list_families
+- Profile tools: add_person, bulk_add_persons, bulk_upsert_persons, get_person, update_person, search_persons
 - Donation tools: add_donation, get_donations, donation_summary
 
 Author: Shrinivas Deshpande
@@ -77,6 +77,26 @@ def create_family(surname: str, city: str, description: str = "") -> dict:
     }
 
 
+@mcp.tool()
+def bulk_create_families(families: List[dict]) -> dict:
+    """
+    Create several families in one call.
+    
+    Args:
+        families: List of {"surname", "city", "description"} dicts
+        
+    Returns:
+        Created families, in the same order as the input
+    """
+    registry = get_registry()
+    created = registry.create_families(families)
+    return {
+        "success": True,
+        "count": len(created),
+        "families": [f.to_dict() for f in created]
+    }
+
+
 @mcp.tool()
 def preview_family_code(surname: str, city: str) -> dict:
     """
@@ -265,6 +285,69 @@ def add_person(
     }
 
 
+@mcp.tool()
+def bulk_add_persons(persons: List[dict]) -> dict:
+    """
+    Add several new person profiles in one call.
+    
+    No duplicate check is made; use bulk_upsert_persons to reuse matches.
+    
+    Args:
+        persons: List of person dicts with the same fields as add_person
+        
+    Returns:
+        List of {name, person_id}, in the same order as the input
+    """
+    for person in persons:
+        if not person.get("first_name"):
+            return {"success": False, "error": "first_name is required for every person"}
+    
+    store = get_store()
+    profiles = [PersonProfileV2(**person) for person in persons]
+    person_ids = store.add_persons(profiles)
+    
+    return {
+        "success": True,
+        "count": len(person_ids),
+        "persons": [
+            {"name": profile.full_name, "person_id": person_id}
+            for profile, person_id in zip(profiles, person_ids)
+        ]
+    }
+
+
+@mcp.tool()
+def bulk_upsert_persons(persons: List[dict]) -> dict:
+    """
+    Add several person profiles in one call, reusing existing matches.
+    
+    A person is reused when a profile with the same first name, last name
+    and family code already exists.
+    
+    Args:
+        persons: List of person dicts with the same fields as add_person
+        
+    Returns:
+        List of {name, person_id, existing}, in the same order as the input
+    """
+    for person in persons:
+        if not person.get("first_name"):
+            return {"success": False, "error": "first_name is required for every person"}
+    
+    store = get_store()
+    profiles = [PersonProfileV2(**person) for person in persons]
+    results = store.upsert_persons(profiles)
+    
+    return {
+        "success": True,
+        "count": len(results),
+        "persons": [
+            {"name": profile.full_name, "person_id": person_id, "existing": existing}
+            for profile, (person_id, existing) in zip(profiles, results)
+        ]
+    }
+
+
 @mcp.tool()
 def get_person(person_id: int) -> dict:
     """
@@ -694,6 +777,25 @@ def add_relationship(person1_id: int, person2_id: int,
     }
 
 
+@mcp.tool()
+def bulk_add_relationships(relationships: List[dict]) -> dict:
+    """
+    Add several relationships in one call.
+
+    Args:
+        relationships: List of {person1_id, person2_id, relation_type, relation_term} dicts
+
+    Returns:
+        Number of relationships created and success status
+    """
+    store = get_store()
+    count = store.add_relationships(relationships)
+    return {
+        "success": True,
+        "count": count
+    }
+
+
 @mcp.tool()
 def get_relationships(person_id: int) -> dict:
     """
@@ -318,10 +318,7 @@ class CytoscapeTree:
     def _find_in_person_store(self, full_name: str):
         """Find person in legacy PersonStore by name."""
         try:
-            matches = self.person_store.find_by_name(full_name)
-            for match in matches:
-                if match.name.lower() == full_name.lower():
-                    return match
+            return self.person_store.find_exact_ci(full_name)
         except Exception:
             pass
         return None
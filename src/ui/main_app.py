@@ -1386,6 +1386,9 @@ def run_app():
     from pathlib import Path
     from nicegui import app
     app.add_static_files('/static', str(Path(__file__).parent.parent.parent / 'static'))
+    # Open the agent tools' stores before the first request instead of on it
+    from src.agents.adk.tools import warmup
+    app.on_startup(warmup)
 
     app_instance = FamilyNetworkApp()
     app_instance.setup()
@@ -0,0 +1,158 @@
+"""Tests for batched CRM V2 data layer operations."""
+
+import pytest
+import tempfile
+
+
+class TestFamilyRegistryBulk:
+    """Test creating several families in one transaction."""
+    
+    def test_create_families_in_order(self):
+        """Should create families and return them in input order."""
+        from src.graph.family_registry import FamilyRegistry
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            registry = FamilyRegistry(f"{tmpdir}/crm.db")
+            families = registry.create_families([
+                {"surname": "Sharma", "city": "Hyderabad"},
+                {"surname": "Patel", "city": "Mumbai", "description": "Test"},
+            ])
+            
+            assert [f.code for f in families] == ["SHARM-HYD-001", "PATEL-MUM-001"]
+            assert families[1].description == "Test"
+            assert all(f.id for f in families)
+    
+    def test_create_families_sequences_within_batch(self):
+        """Same surname and city in one batch should get increasing sequences."""
+        from src.graph.family_registry import FamilyRegistry
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            registry = FamilyRegistry(f"{tmpdir}/crm.db")
+            registry.create_family("Sharma", "Hyderabad")
+            families = registry.create_families([
+                {"surname": "Sharma", "city": "Hyderabad"},
+                {"surname": "Sharma", "city": "Hyderabad"},
+            ])
+            
+            assert [f.code for f in families] == ["SHARM-HYD-002", "SHARM-HYD-003"]
+
+
+
+class TestCRMStoreV2Bulk:
+    """Test batched profile and relationship writes."""
+    
+    def test_add_persons_in_order(self):
+        """Should insert every profile and return IDs in input order."""
+        from src.graph.crm_store_v2 import CRMStoreV2
+        from src.graph.models_v2 import PersonProfileV2
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = CRMStoreV2(f"{tmpdir}/crm.db")
+            ids = store.add_persons([
+                PersonProfileV2(first_name="Raj", last_name="Sharma"),
+                PersonProfileV2(first_name="Raj", last_name="Sharma"),
+                PersonProfileV2(first_name="Priya", last_name="Sharma"),
+            ])
+            
+            assert len(set(ids)) == 3
+            assert [store.get_person(i).first_name for i in ids] == ["Raj", "Raj", "Priya"]
+    
+    def test_upsert_persons_creates_new(self):
+        """Should insert new profiles and report them as not existing."""
+        from src.graph.crm_store_v2 import CRMStoreV2
+        from src.graph.models_v2 import PersonProfileV2
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = CRMStoreV2(f"{tmpdir}/crm.db")
+            results = store.upsert_persons([
+                PersonProfileV2(first_name="Raj", last_name="Sharma", family_code="SHARM-HYD-001"),
+                PersonProfileV2(first_name="Priya", last_name="Sharma", family_code="SHARM-HYD-001"),
+            ])
+            
+            assert [existing for _, existing in results] == [False, False]
+            assert store.get_person(results[1][0]).first_name == "Priya"
+    
+    def test_upsert_persons_reuses_existing(self):
+        """Should reuse a profile with the same name in the same family."""
+        from src.graph.crm_store_v2 import CRMStoreV2
+        from src.graph.models_v2 import PersonProfileV2
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = CRMStoreV2(f"{tmpdir}/crm.db")
+            raj_id = store.add_person(
+                PersonProfileV2(first_name="Raj", last_name="Sharma", family_code="SHARM-HYD-001")
+            )
+            results = store.upsert_persons([
+                PersonProfileV2(first_name="raj", last_name="sharma", family_code="SHARM-HYD-001"),
+                PersonProfileV2(first_name="Raj", last_name="Sharma", family_code="SHARM-MUM-001"),
+            ])
+            
+            assert results[0] == (raj_id, True)
+            assert results[1][1] is False
+            assert len(store.get_all()) == 2
+    
+    def test_upsert_persons_reuses_within_batch(self):
+        """Should reuse a profile inserted earlier in the same batch, with or without a family."""
+        from src.graph.crm_store_v2 import CRMStoreV2
+        from src.graph.models_v2 import PersonProfileV2
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = CRMStoreV2(f"{tmpdir}/crm.db")
+            results = store.upsert_persons([
+                PersonProfileV2(first_name="Sarah", last_name="Patel"),
+                PersonProfileV2(first_name="SARAH", last_name="PATEL"),
+            ])
+            again = store.upsert_persons([PersonProfileV2(first_name="Sarah", last_name="Patel")])
+            
+            assert results[1] == (results[0][0], True)
+            assert again == [(results[0][0], True)]
+            assert len(store.get_all()) == 1
+    
+    def test_get_ids_by_names(self):
+        """Should resolve full names in one query, skipping unknown names."""
+        from src.graph.crm_store_v2 import CRMStoreV2
+        from src.graph.models_v2 import PersonProfileV2
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = CRMStoreV2(f"{tmpdir}/crm.db")
+            raj_id = store.add_person(PersonProfileV2(first_name="Raj", last_name="Sharma"))
+            amit_id = store.add_person(PersonProfileV2(first_name="Amit"))
+            
+            name_to_id = store.get_ids_by_names(["Raj Sharma", "Amit", "Nobody"])
+            
+            assert name_to_id == {"Raj Sharma": raj_id, "Amit": amit_id}
+    
+    def test_add_relationships(self):
+        """Should insert all relationships in one call."""
+        from src.graph.crm_store_v2 import CRMStoreV2
+        from src.graph.models_v2 import PersonProfileV2
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = CRMStoreV2(f"{tmpdir}/crm.db")
+            raj = store.add_person(PersonProfileV2(first_name="Raj"))
+            priya = store.add_person(PersonProfileV2(first_name="Priya"))
+            amit = store.add_person(PersonProfileV2(first_name="Amit"))
+            
+            count = store.add_relationships([
+                {"person1_id": raj, "person2_id": priya, "relation_type": "spouse", "relation_term": "wife"},
+                {"person1_id": raj, "person2_id": amit, "relation_type": "parent_child"},
+            ])
+            
+            assert count == 2
+            assert store.get_spouses(raj) == [priya]
+            assert store.get_children(raj) == [amit]
+    
+    def test_database_uses_wal(self):
+        """Should open the shared CRM database in WAL mode."""
+        from src.graph.crm_store_v2 import CRMStoreV2
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = CRMStoreV2(f"{tmpdir}/crm.db")
+            
+            with store._connect() as conn:
+                assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+                assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == 5000
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -38,6 +38,14 @@ class TestAudioProcessor:
         recovered = proc.bytes_to_numpy(wav_bytes)
         assert np.allclose(original, recovered, atol=0.001)
 
+    def test_bytes_conversion_saturates(self):
+        """Samples beyond [-1, 1] should clip, not wrap around."""
+        from src.audio.processor import AudioProcessor
+        proc = AudioProcessor(sample_rate=16000)
+        recovered = proc.bytes_to_numpy(proc.numpy_to_bytes(np.array([1.5, -1.5])))
+        assert recovered[0] > 0.99
+        assert recovered[1] == -1.0
+
 
 class TestAudioValidator:
     """Test audio validation."""
@@ -49,6 +49,42 @@ class TestAudioWebSocketServer:
             response = ws.receive_json()
             assert response["type"] == "error"
 
+    def test_websocket_acks_are_batched(self):
+        """Audio chunks should be acknowledged in batches."""
+        from src.audio.websocket_server import AudioWebSocketServer, create_app
+        import base64
+        import json
+
+        app = create_app()
+        client = TestClient(app)
+        batch = AudioWebSocketServer.ACK_BATCH
+        chunk = json.dumps({"type": "audio_chunk", "data": base64.b64encode(b"\0\0").decode()})
+
+        with client.websocket_connect("/ws/audio") as ws:
+            for _ in range(batch + 3):
+                ws.send_text(chunk)
+            ws.send_text(json.dumps({"type": "ping"}))
+            assert ws.receive_json() == {"type": "ack", "count": batch}
+            assert ws.receive_json() == {"type": "ack", "count": 3}
+            assert ws.receive_json()["type"] == "pong"
+
+    def test_websocket_binary_frames(self):
+        """Binary frames should carry raw audio without base64."""
+        from src.audio.websocket_server import (
+            FRAME_AUDIO_CHUNK, FRAME_AUDIO_END, FRAME_PING, create_app
+        )
+
+        app = create_app()
+        client = TestClient(app)
+
+        with client.websocket_connect("/ws/audio") as ws:
+            ws.send_bytes(bytes([FRAME_PING]))
+            assert ws.receive_json()["type"] == "pong"
+            ws.send_bytes(bytes([FRAME_AUDIO_CHUNK]) + b"\0\0" * 100)
+            ws.send_bytes(bytes([FRAME_AUDIO_END]))
+            assert ws.receive_json() == {"type": "ack", "count": 1}
+            assert ws.receive_json()["type"] in ("error", "validation_error")
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
\ No newline at end of file
@@ -47,6 +47,102 @@ class TestPersonStore:
             results = store.find_by_name("Kumar")
             assert len(results) == 2
     
+    def test_get_name_index(self):
+        """Should map lowercased names to the earliest person ID."""
+        from src.graph.person_store import PersonStore
+        from src.models import Person
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = PersonStore(db_path=f"{tmpdir}/persons.db")
+            
+            first_id = store.add_person(Person(name="Ramesh Kumar"))
+            store.add_person(Person(name="ramesh kumar"))
+            priya_id = store.add_person(Person(name="Priya Sharma"))
+            
+            index = store.get_name_index()
+            assert index == {"ramesh kumar": first_id, "priya sharma": priya_id}
+    
+    def test_find_exact_ci(self):
+        """Should find an exact name match regardless of case."""
+        from src.graph.person_store import PersonStore
+        from src.models import Person
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = PersonStore(db_path=f"{tmpdir}/persons.db")
+            
+            first_id = store.add_person(Person(name="Ramesh Kumar"))
+            store.add_person(Person(name="RAMESH KUMAR"))
+            store.add_person(Person(name="Ramesh Kumar Jr"))
+            
+            assert store.find_exact_ci("ramesh kumar").id == first_id
+            assert store.find_exact_ci("Ramesh") is None
+    
+    def test_find_closest(self):
+        """Should tolerate misspellings and reject unrelated names."""
+        from src.graph.person_store import PersonStore
+        from src.models import Person
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = PersonStore(db_path=f"{tmpdir}/persons.db")
+            
+            alka_id = store.add_person(Person(name="Alka Deshpande"))
+            store.add_person(Person(name="Priya Sharma"))
+            
+            assert store.find_closest("Alaka Deshpande").id == alka_id
+            assert store.find_closest("Nobody Here") is None
+    
+    def test_find_closest_rejects_loose_and_tied_matches(self):
+        """Should not bind a shorter name to a longer one or guess between near ties."""
+        from src.graph.person_store import PersonStore
+        from src.models import Person
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = PersonStore(db_path=f"{tmpdir}/persons.db")
+            
+            store.add_person(Person(name="Ravina"))
+            store.add_person(Person(name="Anil Kumar"))
+            store.add_person(Person(name="Anil Kumari"))
+            
+            assert store.find_closest("Ravi") is None
+            assert store.find_closest("Anil Kumr") is None
+    
+    def test_all_names_snapshot_tracks_version(self):
+        """Should reuse the snapshot until any store instance changes persons."""
+        from src.graph.person_store import PersonStore
+        from src.models import Person
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = PersonStore(db_path=f"{tmpdir}/persons.db")
+            other = PersonStore(db_path=f"{tmpdir}/persons.db")
+            
+            ramesh_id = store.add_person(Person(name="Ramesh Kumar"))
+            snapshot = store.all_names_snapshot()
+            assert snapshot[:2] == (("ramesh kumar",), (ramesh_id,))
+            assert store.all_names_snapshot() is snapshot
+            
+            priya_id = other.add_person(Person(name="Priya Sharma"))
+            names, ids, version = store.all_names_snapshot()
+            assert names == ("ramesh kumar", "priya sharma")
+            assert ids == (ramesh_id, priya_id)
+            assert version != snapshot[2]
+    
+    def test_get_persons(self):
+        """Should fetch several persons by ID, skipping unknown IDs."""
+        from src.graph.person_store import PersonStore
+        from src.models import Person
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = PersonStore(db_path=f"{tmpdir}/persons.db")
+            
+            ramesh_id = store.add_person(Person(name="Ramesh Kumar"))
+            priya_id = store.add_person(Person(name="Priya Sharma"))
+            
+            people = store.get_persons([priya_id, ramesh_id, priya_id, 999])
+            assert {pid: p.name for pid, p in people.items()} == {
+                ramesh_id: "Ramesh Kumar", priya_id: "Priya Sharma"
+            }
+            assert store.get_persons([]) == {}
+    
     def test_update_person(self):
         """Should update person attributes."""
         from src.graph.person_store import PersonStore
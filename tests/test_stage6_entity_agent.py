@@ -25,6 +25,32 @@ class TestEntityExtractorAgent:
         assert result["success"] == False
         assert "empty" in result["error"].lower()
     
+    def test_short_generic_text_is_skipped(self):
+        """Short text with no names or relation terms should not reach the model."""
+        from src.agents.entity_extractor import EntityExtractorAgent
+        agent = EntityExtractorAgent(api_key="test-key")
+        agent._generate = lambda text: pytest.fail("model should not be called")
+        result = agent.extract_entities("okay thank you")
+        assert result["success"] == True
+        assert result["skipped"] == True
+        assert result["persons"] == []
+    
+    @pytest.mark.parametrize("text", [
+        "Ravi married Priya Sharma",
+        "Ravi lives in Pune",
+        "my parents are here",
+        "call me at 9876543210",
+        "मेरे पिता राम हैं",
+    ])
+    def test_text_with_names_or_relations_is_not_skipped(self, text):
+        """Names, relation words, contacts and native script should reach the model."""
+        from src.agents.entity_extractor import EntityExtractorAgent
+        agent = EntityExtractorAgent(api_key="test-key")
+        agent._generate = lambda t: '{"persons": [{"name": "X"}], "relationships": []}'
+        result = agent.extract_entities(text)
+        assert "skipped" not in result
+        assert result["persons"] == [{"name": "X"}]
+    
     def test_extraction_with_real_api(self):
         """Test extraction with real API if key is set."""
         from src.agents.entity_extractor import EntityExtractorAgent
@@ -39,6 +39,27 @@ class TestFamilyAnalytics:
             centrality = analytics.degree_centrality(3)
             assert centrality == 3
     
+    def test_all_degree_centrality_matches_per_person(self):
+        """Batched centrality should match the per-person calculation."""
+        from src.graph.analytics import FamilyAnalytics
+        from src.graph.family_graph import FamilyGraph
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            graph = FamilyGraph(db_path=f"{tmpdir}/family.db")
+            analytics = FamilyAnalytics(family_graph=graph)
+            
+            graph.add_spouse(1, 2)
+            graph.add_parent_child(1, 3)
+            graph.add_parent_child(2, 3)
+            graph.add_sibling(3, 4)
+            
+            person_ids = [1, 2, 3, 4, 5]
+            centralities = analytics.calculate_all_degree_centrality(person_ids)
+            
+            assert list(centralities) == person_ids
+            assert centralities == {pid: analytics.degree_centrality(pid) for pid in person_ids}
+            assert centralities[5] == 0
+    
     def test_find_most_connected(self):
         """Should find most connected members."""
         from src.graph.analytics import FamilyAnalytics
@@ -70,6 +91,27 @@ class TestFamilyAnalytics:
             assert most_connected[0]["person_id"] == id1
             assert most_connected[0]["degree_centrality"] == 4  # spouse + 3 children
     
+    def test_find_bridges(self):
+        """Spouses from different parent families should be bridges."""
+        from src.graph.analytics import FamilyAnalytics
+        from src.graph.family_graph import FamilyGraph
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            graph = FamilyGraph(db_path=f"{tmpdir}/family.db")
+            analytics = FamilyAnalytics(family_graph=graph)
+            
+            # 3 (child of 1) marries 4 (child of 2); 5 and 6 share parent 1
+            graph.add_parent_child(1, 3)
+            graph.add_parent_child(2, 4)
+            graph.add_spouse(3, 4)
+            graph.add_parent_child(1, 5)
+            graph.add_parent_child(1, 6)
+            graph.add_spouse(5, 6)
+            
+            bridges = analytics.find_bridges([3, 4, 5, 6])
+            
+            assert [(b["person_id"], b["spouse_id"]) for b in bridges] == [(3, 4), (4, 3)]
+    
     def test_generation_depth(self):
         """Should calculate generation depth."""
         from src.graph.analytics import FamilyAnalytics
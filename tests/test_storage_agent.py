@@ -4,7 +4,9 @@ import asyncio
 import sys
 sys.path.insert(0, ".")
 
-from src.agents.adk.storage_agent import StorageAgent, store_extraction
+from src.agents.adk.storage_agent import (
+    StorageAgent, StorageResult, store_extraction, _csr_speaker_family, _split_name,
+)
 
 
 async def test_storage_agent():
@@ -116,6 +118,148 @@ async def test_storage_agent():
         return None
 
 
+async def test_store_without_persons_returns_fresh_result():
+    """Empty and invalid extractions should each get their own result."""
+    agent = StorageAgent.__new__(StorageAgent)
+
+    empty = await agent.store({"success": True, "persons": [], "relationships": []})
+    invalid = await agent.store({"success": False})
+
+    again = await agent.store({"success": True, "persons": [], "relationships": []})
+
+    assert empty is not again
+    assert empty.success and empty.summary == "No persons to store"
+    assert empty.errors == [] and isinstance(empty.persons_created, list)
+    assert not invalid.success
+    assert invalid.errors == ["Invalid extraction result"]
+
+
+async def test_ensure_families_reuses_and_creates(monkeypatch):
+    """Existing families are looked up concurrently; misses are created together."""
+    import src.agents.adk.storage_agent as storage_module
+
+    calls = []
+
+    async def fake_call_crm_tool(tool, args):
+        calls.append(tool)
+        if tool == "list_families":
+            if args["surname"] == "Sharma":
+                return {"success": True, "count": 1, "families": [{"id": 1, "code": "SHARM-HYD-001"}]}
+            return {"success": True, "count": 0, "families": []}
+        if tool == "get_family":
+            return {"success": True, "found": args["code"] in active, "family": None}
+        return {"success": True, "families": [{"id": 2, "code": "PATEL-MUM-001"}]}
+
+    active = {"SHARM-HYD-001", "PATEL-MUM-001"}
+
+    monkeypatch.setattr(storage_module, "call_crm_tool", fake_call_crm_tool)
+    storage_module.clear_family_cache()
+
+    agent = StorageAgent.__new__(StorageAgent)
+    result = StorageResult()
+    family_map = await agent._ensure_families(
+        {("Sharma", "Hyderabad"): [{}], ("Patel", "Mumbai"): [{}]}, result
+    )
+
+    assert family_map == {("Sharma", "Hyderabad"): "SHARM-HYD-001", ("Patel", "Mumbai"): "PATEL-MUM-001"}
+    assert calls == ["list_families", "list_families", "bulk_create_families"]
+    assert [f.family_code for f in result.families_created] == ["PATEL-MUM-001"]
+    assert not result.errors
+
+    # Both families are now cached, whatever the case of the surname and city;
+    # a cached code is only re-checked, not searched for again
+    calls.clear()
+    family_map = await agent._ensure_families({("sharma", "HYDERABAD"): [{}]}, StorageResult())
+    assert family_map == {("sharma", "HYDERABAD"): "SHARM-HYD-001"}
+    assert calls == ["get_family"]
+
+    # An archived family is evicted from the cache and looked up again
+    active.discard("PATEL-MUM-001")
+    calls.clear()
+    result = StorageResult()
+    family_map = await agent._ensure_families({("Patel", "Mumbai"): [{}]}, result)
+    assert calls == ["get_family", "list_families", "bulk_create_families"]
+    assert [f.family_code for f in result.families_created] == ["PATEL-MUM-001"]
+    storage_module.clear_family_cache()
+
+
+async def test_store_persons_chunks_whole_families(monkeypatch):
+    """Upserts are split into chunks that never divide a family."""
+    import src.agents.adk.storage_agent as storage_module
+
+    sent = []
+
+    async def fake_call_crm_tool(tool, args):
+        sent.append([p["first_name"] for p in args["persons"]])
+        return {"success": True, "persons": [
+            {"person_id": ord(p["first_name"][0]), "existing": False} for p in args["persons"]
+        ]}
+
+    monkeypatch.setattr(storage_module, "call_crm_tool", fake_call_crm_tool)
+    monkeypatch.setattr(storage_module, "PERSONS_PER_CALL", 2)
+
+    agent = StorageAgent.__new__(StorageAgent)
+    persons = [
+        {"name": "Raj Sharma", "location": "Hyderabad"},
+        {"name": "Sarah Patel", "location": "Mumbai"},
+        {"name": "Priya Sharma", "location": "Hyderabad"},
+    ]
+    result = StorageResult()
+    _, records, family_groups, person_to_family_key = agent._prepare(persons, [], result)
+    family_map = {("Sharma", "Hyderabad"): "SHARM-HYD-001", ("Patel", "Mumbai"): "PATEL-MUM-001"}
+
+    await agent._store_persons(records, family_map, person_to_family_key, result)
+
+    assert sorted(sent) == [["Raj", "Priya"], ["Sarah"]]
+    stored = {p.name: p.person_id for p in result.persons_created}
+    assert stored == {"Raj Sharma": ord("R"), "Priya Sharma": ord("P"), "Sarah Patel": ord("S")}
+
+
+def test_speaker_family_follows_family_edges():
+    """Relatives reach the speaker's family transitively; friends only directly."""
+    agent = StorageAgent.__new__(StorageAgent)
+    relationships = [
+        {"person1": "Raj Sharma", "person2": "Priya Sharma", "relation_term": "wife"},
+        {"person1": "Raj Sharma", "person2": "Amit Sharma", "relation_type": "parent_child"},
+        {"person1": "Amit Sharma", "person2": "Rohan Sharma", "relation_term": "son"},
+        {"person1": "Amit Sharma", "person2": "Sarah Patel", "relation_term": "friend"},
+        {"person1": "raj  sharma.", "person2": "Vikram Rao", "relation_term": "friend"},
+        {"person1": "Vikram Rao", "person2": "Anita Rao", "relation_term": "wife"},
+        {"person1": "Raj Sharma", "person2": ""},
+    ]
+
+    expected = frozenset({"priya sharma", "amit sharma", "rohan sharma", "vikram rao"})
+    assert agent._speaker_family("raj sharma", relationships) == expected
+    assert _csr_speaker_family(relationships, "raj sharma") == expected
+    assert _csr_speaker_family(relationships, "nobody") == frozenset()
+
+
+def test_speaker_grouping_ignores_case_and_punctuation():
+    """Relationship names that differ only in case or punctuation should still group."""
+    agent = StorageAgent.__new__(StorageAgent)
+    persons = [
+        {"name": "Raj Sharma", "location": "Hyderabad", "is_speaker": True},
+        {"name": "Amit Kumar", "location": "Pune"},
+        {"name": "Old Friend", "existing_id": 7},
+    ]
+    relationships = [{"person1": "RAJ SHARMA", "person2": "amit kumar.", "relation_term": "son"}]
+
+    result = StorageResult()
+    new_persons, records, groups, person_to_family_key = agent._prepare(persons, relationships, result)
+
+    assert [d.existing_id for d in result.duplicates_skipped] == [7]
+    assert len(new_persons) == len(records) == 2
+    assert person_to_family_key["Amit Kumar"] == ("Sharma", "Hyderabad")
+    assert list(groups) == [("Sharma", "Hyderabad")]
+
+
+def test_split_name_matches_whitespace_split():
+    """The partition fast path should agree with a plain whitespace split."""
+    for name in ["Raj", "Raj Sharma", "Raj Kumar Sharma", "Raj  Kumar\tSharma", "Raj\u00a0Sharma"]:
+        parts = name.split()
+        assert _split_name(name) == (parts[0], " ".join(parts[1:]), parts[-1])
+
+
 async def test_orchestrator():
     """Test full orchestrator with storage agent."""
     print("\n" + "=" * 60)